@@ -11,6 +11,10 @@
     iv. Total and Average Waiting time for the entire processes
 """
 
+import engine
+import metrics
+from workload import Workload
+
 def main():
     while True:
         try:
@@ -64,64 +68,16 @@ def roundRobin(processes, TQ):
     print("Sorted by arrival time:")
     print(processes_copy)
 
-    # ----------------------------------------
-    # Initialize variables
-    current_time = 0;
-
-    # Ready queue and execution log
-    ready_queue = [];
-    execution_log = [];
-
-    # Add newly arrived processes to the ready_queue
-    for i in range(len(processes_copy)):
-        if processes_copy[i][1] <= current_time and processes_copy[i] not in ready_queue:
-            ready_queue.append(processes_copy[i]);
-            processes_copy.pop(i);
-            break;
-    
-    # TEST OUTPUT
-    print("Ready Queue:")
-    print(ready_queue)
-    print("Processes Remaining:")
-    print(processes_copy)
-
     # ----------------------------------------
     # Start Round Robin
-    while ready_queue:
-        if ready_queue: # Check if the ready queue is not empty
-            process = ready_queue.pop(0); # Get the first process in the ready queue (FIFO)
-            process_name, arrival_time, burst_time, priority = process;  # Extract process details
-
-            # Execute the process for the time quantum
-            time_executed = min(TQ, burst_time);
-            current_time += time_executed;
-
-            # Update process details
-            burst_time -= time_executed;
-            execution_log.append([process_name, (current_time - time_executed), current_time]);
-
-            # Add newly arrived processes to the ready queue
-            i = 0
-            while i < len(processes_copy):
-                if processes_copy[i][1] <= current_time and processes_copy[i] not in ready_queue:
-                    ready_queue.append(processes_copy[i])
-                    processes_copy.pop(i)
-                else:
-                    i += 1
-
-            # Requeue the process if it still has burst time left
-            if burst_time > 0:
-                ready_queue.append((process_name, arrival_time, burst_time, priority))
-        else:
-            # If the ready queue is empty, move to the next arrival time
-            current_time = processes_copy[0][1]
-            ready_queue.append(processes_copy.pop(0))
-
-            # TEST OUTPUT
-            print("Ready Queue:")
-            print(ready_queue)
-            print("Processes Remaining:")
-            print(processes_copy)
+    # The engine's hungry tie-break (rule 3 above): jobs queued at the same
+    # moment go lowest priority number first, and ones that have not run yet
+    # go ahead of the one whose time quantum just ended
+    workload = Workload.from_columns([process[1] for process in processes_copy],
+                                     [process[2] for process in processes_copy],
+                                     [process[3] for process in processes_copy]);
+    result = engine.simulate(workload, "RR", time_quantum=TQ, tie_break="hungry");
+    execution_log = [[processes_copy[j][0], start, end] for j, start, end in result.execution_log];
 
     # ----------------------------------------
     # Display Execution Log
@@ -155,6 +111,7 @@ def ganttChart(execution_log):
 def calculations(processes,execution_log):
     num_processes = len(processes)
     completion_times = [0] * num_processes  # List to store completion times
+    first_starts = [None] * num_processes   # List to store first dispatch times
     turnaround_times = [0] * num_processes  # List to store TAT
     waiting_times = [0] * num_processes     # List to store WT
 
@@ -164,10 +121,13 @@ def calculations(processes,execution_log):
         end_time = log[2]
         process_index = int(process_name[1:])  # Extract process number from "P0", "P1", etc.
         completion_times[process_index] = max(completion_times[process_index], end_time)
+        if first_starts[process_index] is None:
+            first_starts[process_index] = log[1]
 
     # Calculate TAT and WT for each process
     total_tat = 0
     total_wt = 0
+    run = metrics.RunMetrics()  # Percentiles, response time, slowdown, throughput
     print("\n")
     print("Process\tArrival\tBurst\tCompletion\tTAT\tWT")
     
@@ -180,6 +140,7 @@ def calculations(processes,execution_log):
         waiting_times[i] = wt
         total_tat += tat
         total_wt += wt
+        run.add_job(arrival, burst, completion_times[i], first_starts[i])
 
         print(f"{name}\t{arrival}\t{burst}\t{completion_times[i]}\t\t{tat}\t{wt}")
 
@@ -188,6 +149,8 @@ def calculations(processes,execution_log):
     avg_wt = total_wt / num_processes
     print(f"\nAverage Turnaround Time: {avg_tat:.2f}")
     print(f"Average Waiting Time: {avg_wt:.2f}")
+    metrics.print_report(run)
 
-main();
+if __name__ == "__main__":
+    main()
 
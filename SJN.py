@@ -112,4 +112,5 @@ def calculations(processes, execution_log):
     print(f"\nAverage Turnaround Time: {avg_tat:.2f}")
     print(f"Average Waiting Time: {avg_wt:.2f}")
 
-main()
+if __name__ == "__main__":
+    main()
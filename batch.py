@@ -0,0 +1,427 @@
+import argparse
+import os
+from contextlib import ExitStack
+from array import array
+from fractions import Fraction
+from concurrent.futures import ProcessPoolExecutor
+
+import checkpoint as checkpoints
+import compiled_processes
+import engine
+import loader
+import metrics
+import probe
+import tracefile
+from workload import Result
+
+# Workload of the current worker process, set once by _init_worker so it is
+# not pickled again for every task
+_worker_workload = None
+
+
+def _init_worker(workload):
+    global _worker_workload
+    _worker_workload = workload
+
+
+def percentile(sorted_values, p):
+    # Nearest-rank percentile of an already sorted sequence
+    if not sorted_values:
+        return 0
+    rank = max(1, -(-p * len(sorted_values) // 100))  # ceil(p * n / 100)
+    return sorted_values[int(rank) - 1]
+
+
+def context_switches(execution_log):
+    # Number of times the CPU moves on to a different job than the one that
+    # ran last. The very first dispatch is not counted.
+    switches = 0
+    previous = None
+    for j, _, _ in execution_log:
+        if previous is not None and j != previous:
+            switches += 1
+        previous = j
+    return switches
+
+
+def summarize(result):
+    # Metrics of one run as a flat dict, the row format of the batch tables
+    turnaround = sorted(result.turnaround)
+    waiting = sorted(result.waiting)
+    log = result.execution_log
+    n = len(result)
+    return {
+        "avg_tat": sum(turnaround) / n,
+        "p50_tat": percentile(turnaround, 50),
+        "p95_tat": percentile(turnaround, 95),
+        "p99_tat": percentile(turnaround, 99),
+        "avg_wt": sum(waiting) / n,
+        "p50_wt": percentile(waiting, 50),
+        "p95_wt": percentile(waiting, 95),
+        "p99_wt": percentile(waiting, 99),
+        "context_switches": context_switches(log),
+        "makespan": log[-1][2] if log else 0,
+    }
+
+
+def _sweep_one(time_quantum):
+    result = engine.simulate(_worker_workload, "RR", time_quantum=time_quantum)
+    row = {"quantum": time_quantum}
+    row.update(summarize(result))
+    return row
+
+
+def sweep_quantum(workload, quanta, max_workers=None):
+    # Run Round Robin once per time quantum, spread across a process pool.
+    # The workload is sent to each worker once, when the worker starts, and
+    # the rows come back in the order of quanta.
+    quanta = list(quanta)
+    if any(q <= 0 for q in quanta):
+        raise ValueError("Time quantum must be positive")
+    if max_workers is None:
+        max_workers = min(os.cpu_count() or 1, len(quanta)) or 1
+    chunksize = max(1, len(quanta) // (max_workers * 4))
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                             initargs=(workload,)) as executor:
+        return list(executor.map(_sweep_one, quanta, chunksize=chunksize))
+
+
+def _compare_one(task):
+    algorithm, params = task
+    result = engine.simulate(_worker_workload, algorithm, **params)
+    # Only the outcome travels back, the parent already has the workload
+    return result.completion, result.execution_log
+
+
+def _params(algorithm, time_quantum=None, tie_break="index"):
+    # simulate() params of one algorithm; MLFQ has no tie-break
+    params = {}
+    if algorithm == "RR":
+        params["time_quantum"] = time_quantum
+    if tie_break != "index" and algorithm != "MLFQ":
+        params["tie_break"] = tie_break
+    return params
+
+
+def compare_algorithms(workload, algorithms=None, time_quantum=None, max_workers=None,
+                       mp_context=None, tie_break="index"):
+    # Run every registered algorithm (or the given codes) on the same
+    # workload, one worker process each. Returns one row per algorithm with
+    # the summarize() metrics plus the full Result under "result".
+    algorithms = list(engine.ALGORITHMS if algorithms is None else algorithms)
+    for algorithm in algorithms:
+        if algorithm not in engine.ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+    if "RR" in algorithms and (time_quantum is None or time_quantum <= 0):
+        raise ValueError("Time quantum must be positive")
+    tasks = [(a, _params(a, time_quantum, tie_break)) for a in algorithms]
+    if max_workers is None:
+        max_workers = min(os.cpu_count() or 1, len(tasks)) or 1
+
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context,
+                             initializer=_init_worker, initargs=(workload,)) as executor:
+        outputs = list(executor.map(_compare_one, tasks))
+
+    report = []
+    for (algorithm, params), (completion, log) in zip(tasks, outputs):
+        result = Result(workload, algorithm, params, completion, log)
+        row = {"algorithm": algorithm}
+        row.update(summarize(result))
+        row["result"] = result
+        report.append(row)
+    return report
+
+
+def run_header(workload, algorithm, params):
+    # What a checkpoint of run_streaming has to match to be resumed
+    return {"algorithm": algorithm, "params": params, "workload": checkpoints.fingerprint(workload)}
+
+
+def run_streaming(workload, algorithm, log_file=None, trace=None, probe=None, checkpoint=None,
+                  resume=None, **params):
+    # One run in constant memory on top of the workload itself: segments are
+    # written to log_file (a text file, optional) as pid,start,end lines
+    # and/or to trace (a tracefile.TraceWriter) the moment the engine decides
+    # them, and jobs go into an online metrics.RunMetrics as they finish.
+    # A probe.Probe, if given, counts the run.
+    #
+    # With a checkpoint.Checkpointer the run is saved as it goes, metrics
+    # and output file offsets included. resume is a loaded checkpoint of
+    # the same run; log_file and trace must then already be cut back to the
+    # offsets it records ("log_offset", "trace").
+    completion = array("q", bytes(8 * len(workload)))
+    pid = workload.pid
+    run = metrics.RunMetrics()
+    first_start = {}
+    segments = 0
+    header = run_header(workload, algorithm, params)
+
+    engine_state = None
+    if resume is not None:
+        if resume["run"] != header:
+            raise ValueError("checkpoint is of a different workload, algorithm or params")
+        run, first_start, segments = resume["metrics"], resume["first_start"], resume["segments"]
+        engine_state = resume["engine"]
+    elif log_file is not None:
+        log_file.write("pid,start,end\n")
+
+    if checkpoint is not None:
+        def snapshot():
+            state = {"run": header, "metrics": run, "first_start": first_start,
+                     "segments": segments}
+            if log_file is not None:
+                log_file.flush()
+                state["log_offset"] = log_file.tell()
+            if trace is not None:
+                trace.flush()
+                state["trace"] = (trace.file.tell(), trace.count)
+            return state
+        checkpoint.attach(snapshot)
+
+    stream = engine.stream(workload, algorithm, completion, probe, checkpoint, engine_state, **params)
+    for j, start, end in metrics.track(stream, workload, completion, run, first_start):
+        segments += 1
+        if log_file is not None:
+            log_file.write(f"P{pid[j]},{start},{end}\n")
+        if trace is not None:
+            trace.write(j, start, end)
+
+    row = {"algorithm": algorithm, "segments": segments}
+    row.update(run.report())
+    return row
+
+
+AGING_COLUMNS = ["aging_rate", "avg_wt", "p50_wt", "p95_wt", "p99_wt", "max_wt", "p99_tat"]
+
+
+def aging_report(workload, rates, algorithm="NP"):
+    # NP or PP once per aging rate, streamed, with the waiting time tail of
+    # each run. Rate 0 is plain priority scheduling, the baseline the other
+    # rows trade average waiting time against.
+    rows = []
+    for rate in rates:
+        report = run_streaming(workload, algorithm, aging_rate=rate)
+        rows.append({column: report[column] for column in AGING_COLUMNS[1:]})
+        rows[-1]["aging_rate"] = str(rate)
+    return rows
+
+
+def parse_quanta(text):
+    # "1,2,4,8", "1-20" or "10-100:10", or any comma separated mix of these
+    quanta = []
+    for part in text.split(","):
+        part = part.strip()
+        if "-" in part:
+            bounds, _, step = part.partition(":")
+            low, high = bounds.split("-")
+            quanta.extend(range(int(low), int(high) + 1, int(step or 1)))
+        else:
+            quanta.append(int(part))
+    return quanta
+
+
+def print_rows(rows, columns):
+    # Same boxed layout as compiled_processes.print_table
+    def fmt(value):
+        return f"{value:.2f}" if isinstance(value, float) else str(value)
+
+    widths = [max(len(column), *(len(fmt(row[column])) for row in rows)) for column in columns]
+    separator = "+" + "+".join("-" * (w + 2) for w in widths) + "+"
+    print(separator)
+    print("|" + "|".join(f" {c.center(w)} " for c, w in zip(columns, widths)) + "|")
+    print(separator)
+    for row in rows:
+        print("|" + "|".join(f" {fmt(row[c]).center(w)} " for c, w in zip(columns, widths)) + "|")
+    print(separator)
+
+
+METRIC_COLUMNS = ["avg_tat", "p50_tat", "p95_tat", "p99_tat",
+                  "avg_wt", "p50_wt", "p95_wt", "p99_wt", "context_switches", "makespan"]
+
+
+def show_trace(parser, args):
+    # Everything is read through the memory map, a trace of any size opens
+    # instantly and is streamed once per report
+    try:
+        reader = tracefile.TraceReader(args.trace)
+        workload = loader.load_workload(args.workload) if args.workload else None
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    with reader:
+        print(f"{engine.ALGORITHMS.get(reader.algorithm, reader.algorithm)} {reader.params}")
+        row = {"jobs": len(reader.pids), "segments": len(reader), "makespan": reader.makespan(),
+               "context_switches": context_switches(reader)}
+        print_rows([row], list(row))
+        if workload is not None:
+            try:
+                run = reader.measure(workload)
+            except ValueError as e:
+                parser.error(str(e))
+            print_rows([run.report()], metrics.REPORT_COLUMNS)
+        if args.gantt:
+            compiled_processes.print_gantt_chart(reader.pid_log())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch runs of the CPU schedulers")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sweep = commands.add_parser("sweep", help="Round Robin time quantum sweep")
+    sweep.add_argument("workload", help="CSV or JSONL file with pid,arrival,burst,priority rows")
+    sweep.add_argument("--quanta", required=True, help='e.g. "1,2,4,8" or "1-100" or "10-200:10"')
+    sweep.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+
+    compare = commands.add_parser("compare", help="Run every algorithm on the same workload")
+    compare.add_argument("workload", help="CSV or JSONL file with pid,arrival,burst,priority rows")
+    compare.add_argument("--algorithms", default=",".join(engine.ALGORITHMS),
+                         help="Comma separated algorithm codes (default: all)")
+    compare.add_argument("--quantum", type=int, default=3, help="Round Robin time quantum")
+    compare.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    compare.add_argument("--tie-break", choices=list(engine.TIE_BREAKS), default="index")
+    compare.add_argument("--logs", action="store_true", help="Also print every Gantt chart")
+
+    run = commands.add_parser("run", help="Stream one algorithm, optionally writing the log")
+    run.add_argument("workload", help="CSV or JSONL file with pid,arrival,burst,priority rows")
+    run.add_argument("--algorithm", choices=list(engine.ALGORITHMS), required=True)
+    run.add_argument("--quantum", type=int, default=3, help="Round Robin time quantum")
+    run.add_argument("--levels", default=",".join(map(str, engine.MLFQ_QUANTA)),
+                     help="MLFQ time quantum of each level, top level first")
+    run.add_argument("--boost", type=int, default=engine.MLFQ_BOOST,
+                     help="MLFQ time between priority boosts (0 for none)")
+    run.add_argument("--tie-break", choices=list(engine.TIE_BREAKS), default="index",
+                     help="Order of equally ranked ready jobs (not MLFQ)")
+    run.add_argument("--aging", type=Fraction, default=0,
+                     help="NP/PP priority levels a waiting job gains per time unit, e.g. 0.01 or 1/50")
+    run.add_argument("--log", default=None, help="Write the execution log to this CSV file")
+    run.add_argument("--trace", default=None, help="Write the execution log to this binary trace file")
+    run.add_argument("--counters", action="store_true", help="Also print the scheduler counters")
+    run.add_argument("--checkpoint", default=None,
+                     help="Save the run to this file as it goes, see --every-time/--every-seconds")
+    run.add_argument("--every-time", type=int, default=None,
+                     help="Checkpoint every this many units of simulated time")
+    run.add_argument("--every-seconds", type=float, default=None,
+                     help="Checkpoint every this many seconds of wall time (default: 60)")
+    run.add_argument("--resume", action="store_true",
+                     help="Carry on from the --checkpoint file, with the same options as the saved run")
+
+    aging = commands.add_parser("aging", help="Waiting time tail of NP or PP at several aging rates")
+    aging.add_argument("workload", help="CSV or JSONL file with pid,arrival,burst,priority rows")
+    aging.add_argument("--algorithm", choices=["NP", "PP"], default="NP")
+    aging.add_argument("--rates", default="0,0.001,0.01,0.1",
+                       help="Comma separated aging rates, priority levels per time unit")
+
+    show = commands.add_parser("trace", help="Summarize a binary trace file written by run --trace")
+    show.add_argument("trace", help="Trace file")
+    show.add_argument("--workload", default=None, help="Workload the trace was run on, for the full metrics")
+    show.add_argument("--gantt", action="store_true", help="Also print the Gantt chart")
+
+    args = parser.parse_args(argv)
+    if args.command == "trace":
+        show_trace(parser, args)
+        return
+    try:
+        algorithm = "RR" if args.command == "sweep" else getattr(args, "algorithm", None)
+        workload = loader.load_workload(args.workload, algorithm)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    if not len(workload):
+        parser.error("workload is empty")
+
+    if args.command == "sweep":
+        try:
+            quanta = parse_quanta(args.quanta)
+        except ValueError:
+            parser.error(f"invalid --quanta: {args.quanta!r}")
+        if not quanta or min(quanta) <= 0:
+            parser.error("time quanta must be positive")
+        rows = sweep_quantum(workload, quanta, args.workers)
+        print_rows(rows, ["quantum"] + METRIC_COLUMNS)
+    elif args.command == "compare":
+        algorithms = args.algorithms.split(",")
+        for algorithm in algorithms:
+            if algorithm not in engine.ALGORITHMS:
+                parser.error(f"unknown algorithm {algorithm!r} (choose from {', '.join(engine.ALGORITHMS)})")
+        if "RR" in algorithms and args.quantum <= 0:
+            parser.error("time quantum must be positive")
+        report = compare_algorithms(workload, algorithms, args.quantum, args.workers,
+                                    tie_break=args.tie_break)
+        print_rows(report, ["algorithm"] + METRIC_COLUMNS)
+        if args.logs:
+            for row in report:
+                print(f"\n{engine.ALGORITHMS[row['algorithm']]}:", end="")
+                compiled_processes.print_gantt_chart(row["result"].pid_log())
+    elif args.command == "aging":
+        try:
+            rates = [Fraction(rate) for rate in args.rates.split(",")]
+        except ValueError:
+            parser.error(f"invalid --rates: {args.rates!r}")
+        if any(rate < 0 for rate in rates):
+            parser.error("aging rates must not be negative")
+        print_rows(aging_report(workload, rates, args.algorithm), AGING_COLUMNS)
+    elif args.command == "run":
+        if args.algorithm == "MLFQ" and args.tie_break != "index":
+            parser.error("MLFQ has no tie-break option")
+        if args.aging and args.algorithm not in ("NP", "PP"):
+            parser.error("--aging is only for NP and PP")
+        if args.algorithm == "RR" and args.quantum <= 0:
+            parser.error("time quantum must be positive")
+        params = _params(args.algorithm, args.quantum, args.tie_break)
+        if args.algorithm == "MLFQ":
+            try:
+                params["quanta"] = [int(q) for q in args.levels.split(",")]
+            except ValueError:
+                parser.error(f"invalid --levels: {args.levels!r}")
+            if min(params["quanta"]) <= 0 or args.boost < 0:
+                parser.error("MLFQ time quanta and boost interval must be positive")
+            params["boost_interval"] = args.boost or None
+        elif args.aging:
+            if args.aging < 0:
+                parser.error("aging rate must not be negative")
+            params["aging_rate"] = args.aging
+        saver = resume = None
+        if args.checkpoint is None:
+            if args.resume or args.every_time is not None or args.every_seconds is not None:
+                parser.error("--resume, --every-time and --every-seconds need --checkpoint")
+        else:
+            if args.counters:
+                parser.error("--counters are not checkpointed, leave them out")
+            every_seconds = args.every_seconds
+            if every_seconds is None and args.every_time is None:
+                every_seconds = 60
+            try:
+                saver = checkpoints.Checkpointer(args.checkpoint, args.every_time, every_seconds)
+                resume = checkpoints.load(args.checkpoint) if args.resume else None
+            except (OSError, ValueError) as e:
+                parser.error(str(e))
+            if resume is not None and resume["run"] != run_header(workload, args.algorithm, params):
+                parser.error("checkpoint is of a different workload, algorithm or options")
+            if resume is not None and ((args.log is not None) != ("log_offset" in resume) or
+                                       (args.trace is not None) != ("trace" in resume)):
+                parser.error("--log and --trace must be given as in the checkpointed run")
+        with ExitStack() as stack:
+            log_file = trace = None
+            if resume is None:
+                log_file = stack.enter_context(open(args.log, "w")) if args.log else None
+                trace = stack.enter_context(tracefile.TraceWriter(
+                    args.trace, args.algorithm, params, workload.pid)) if args.trace else None
+            else:
+                # Drop whatever was written after the checkpoint
+                if args.log:
+                    log_file = stack.enter_context(open(args.log, "r+"))
+                    log_file.seek(resume["log_offset"])
+                    log_file.truncate()
+                if args.trace:
+                    offset, count = resume["trace"]
+                    trace = stack.enter_context(tracefile.TraceWriter.reopen(
+                        args.trace, offset, count, workload.pid))
+            counters = probe.Probe() if args.counters else None
+            row = run_streaming(workload, args.algorithm, log_file, trace, counters, saver, resume,
+                                **params)
+        print_rows([row], ["algorithm", "segments", "makespan"] + metrics.REPORT_COLUMNS)
+        if counters is not None:
+            print_rows([counters.counters()], list(probe.COUNTERS))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from collections import deque
+from datetime import datetime, timezone
+
+import compiled_processes
+import engine
+import generator
+from batch import print_rows
+from differential import load_script
+
+SIZES = [10, 100, 1000, 10_000, 100_000, 1_000_000]
+QUANTUM = 4
+
+# Workload shapes, as generator.generate_workload arguments. The arrival
+# rate keeps the CPU about 90% busy for a mean burst of 10.
+DISTRIBUTIONS = {
+    "poisson-exponential": {"arrival": "poisson", "burst": "exponential", "rate": 0.09},
+    "bursty-pareto": {"arrival": "bursty", "burst": "pareto", "rate": 0.09},
+    "poisson-lognormal": {"arrival": "poisson", "burst": "lognormal", "sigma": 1.5, "rate": 0.09},
+}
+
+
+def _compiled(schedule, *args):
+    # compiled_processes / cpu_scheduling style: a list of Process objects
+    def setup(workload):
+        processes = [compiled_processes.Process(pid, a, b, p)
+                     for pid, a, b, p in zip(workload.pid, workload.arrival,
+                                             workload.burst, workload.priority)]
+        return lambda: len(schedule(processes, *args))
+    return setup
+
+
+def _engine(algorithm, **params):
+    # The engine on its own, streaming, so no log is kept
+    def setup(workload):
+        def run():
+            counter = deque(enumerate(engine.stream(workload, algorithm, **params), 1), maxlen=1)
+            return counter[0][0] if counter else 0
+        return run
+    return setup
+
+
+def _quiet(run):
+    # The scripts print their whole result table, that output goes to
+    # os.devnull but its formatting is part of what is measured
+    def quiet():
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            return run()
+    return quiet
+
+
+def _sjn_script(workload):
+    module = load_script("SJN.py")
+    processes = [[f"P{pid}", a, b] for pid, a, b in zip(workload.pid, workload.arrival, workload.burst)]
+    return _quiet(lambda: len(module.non_preemptive_sjn(processes)))
+
+
+def _rr_script(workload):
+    module = load_script("RoundRobin.py")
+    processes = [[f"P{pid}", a, b, p] for pid, a, b, p in zip(
+        workload.pid, workload.arrival, workload.burst, workload.priority)]
+    return _quiet(lambda: len(module.roundRobin(processes, QUANTUM)))
+
+
+def _priority_script(filename, function):
+    def setup(workload):
+        module = load_script(filename)
+        processes = [module.Process(pid, a, b, p) for pid, a, b, p in zip(
+            workload.pid, workload.arrival, workload.burst, workload.priority)]
+        # These print the log rather than return it, so there is no segment
+        # count (the call returns None)
+        return _quiet(lambda: getattr(module, function)(processes))
+    return setup
+
+
+# name -> (setup, largest workload it is run on). setup(workload) does the
+# untimed conversion and returns the timed call, which returns the number of
+# segments it produced, or None when it cannot tell. Implementations that keep a Python object per job or
+# print everything stop at 1M or 100k jobs, the SJN script (O(n^3)) at 300.
+CASES = {
+    "sjn_scheduling": (_compiled(compiled_processes.sjn_scheduling), 1_000_000),
+    "round_robin_scheduling": (_compiled(compiled_processes.round_robin_scheduling, QUANTUM), 1_000_000),
+    "priority_scheduling": (_compiled(compiled_processes.priority_scheduling, False), 1_000_000),
+    "priority_scheduling_preemptive": (_compiled(compiled_processes.priority_scheduling, True), 1_000_000),
+    "srtf_scheduling": (_compiled(compiled_processes.srtf_scheduling), 1_000_000),
+    "mlfq_scheduling": (_compiled(compiled_processes.mlfq_scheduling), 1_000_000),
+    "engine.SJN": (_engine("SJN"), 10_000_000),
+    "engine.RR": (_engine("RR", time_quantum=QUANTUM), 10_000_000),
+    "engine.NP": (_engine("NP"), 10_000_000),
+    "engine.PP": (_engine("PP"), 10_000_000),
+    "engine.SRTF": (_engine("SRTF"), 10_000_000),
+    "engine.MLFQ": (_engine("MLFQ"), 10_000_000),
+    "SJN.non_preemptive_sjn": (_sjn_script, 300),
+    "RoundRobin.roundRobin": (_rr_script, 100_000),
+    "non_preemptive_priority_scheduling": (
+        _priority_script("non_preemptive_priority.py", "non_preemptive_priority_scheduling"), 100_000),
+    "preemptive_priority_scheduling": (
+        _priority_script("preemptive priority.py", "preemptive_priority_scheduling"), 100_000),
+}
+
+
+def measure(setup, workload, repeat=1, memory=True):
+    # Best wall time of repeat runs, then one more run under tracemalloc for
+    # the peak memory allocated by the call itself (setup excluded)
+    seconds = None
+    for _ in range(repeat):
+        run = setup(workload)
+        start = time.perf_counter()
+        segments = run()
+        elapsed = time.perf_counter() - start
+        seconds = elapsed if seconds is None else min(seconds, elapsed)
+    peak = None
+    if memory:
+        run = setup(workload)
+        tracemalloc.start()
+        try:
+            run()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return {"seconds": seconds, "peak_bytes": peak, "segments": segments,
+            "segments_per_sec": segments / seconds if segments is not None and seconds else None}
+
+
+def run_suite(cases=None, sizes=SIZES, distributions=None, seed=1, repeat=1, memory=True,
+              progress=None):
+    # One row per (case, distribution, size) up to each case's size limit
+    cases = list(CASES if cases is None else cases)
+    distributions = list(DISTRIBUTIONS if distributions is None else distributions)
+    rows = []
+    for distribution in distributions:
+        for n in sizes:
+            workload = generator.generate_workload(n, seed, **DISTRIBUTIONS[distribution])
+            for case in cases:
+                setup, max_jobs = CASES[case]
+                if n > max_jobs:
+                    continue
+                row = {"case": case, "distribution": distribution, "jobs": n}
+                row.update(measure(setup, workload, repeat, memory))
+                rows.append(row)
+                if progress is not None:
+                    progress(row)
+    return rows
+
+
+def _key(row):
+    return row["case"], row["distribution"], row["jobs"]
+
+
+def compare(rows, baseline_rows, threshold=0.1, min_seconds=0.01):
+    # Rows that ran more than threshold slower than the baseline. Timings
+    # under min_seconds are too noisy to call a regression.
+    baseline = {_key(row): row for row in baseline_rows}
+    report = []
+    for row in rows:
+        base = baseline.get(_key(row))
+        if base is None or not base["seconds"]:
+            continue
+        ratio = row["seconds"] / base["seconds"]
+        report.append({
+            "case": row["case"], "distribution": row["distribution"], "jobs": row["jobs"],
+            "baseline": base["seconds"], "seconds": row["seconds"], "ratio": ratio,
+            "regression": ratio > 1 + threshold and max(row["seconds"], base["seconds"]) >= min_seconds,
+        })
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every scheduler implementation")
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)),
+                        help="Comma separated job counts (up to 10000000)")
+    parser.add_argument("--cases", default=",".join(CASES), help="Comma separated case names")
+    parser.add_argument("--distributions", default=",".join(DISTRIBUTIONS),
+                        help="Comma separated workload shapes")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=1, help="Timed runs per case, the best one counts")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc run")
+    parser.add_argument("--output", default=None, help="Write the results to this JSON file")
+    parser.add_argument("--baseline", default=None, help="Results JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Allowed slowdown against the baseline (0.1 = 10%%)")
+
+    args = parser.parse_args(argv)
+    cases = args.cases.split(",")
+    distributions = args.distributions.split(",")
+    for name in cases:
+        if name not in CASES:
+            parser.error(f"unknown case {name!r}")
+    for name in distributions:
+        if name not in DISTRIBUTIONS:
+            parser.error(f"unknown distribution {name!r}")
+    baseline = None
+    if args.baseline:
+        try:
+            with open(args.baseline) as f:
+                baseline = json.load(f)["results"]
+        except (OSError, ValueError, KeyError) as e:
+            parser.error(f"cannot read baseline: {e}")
+
+    def progress(row):
+        peak = "-" if row["peak_bytes"] is None else f"{row['peak_bytes'] / 2**20:.1f} MiB"
+        print(f"{row['case']:<36} {row['distribution']:<20} {row['jobs']:>9} "
+              f"{row['seconds']:>10.4f} s {peak:>12}", flush=True)
+
+    rows = run_suite(cases, [int(n) for n in args.sizes.split(",")], distributions,
+                     args.seed, args.repeat, not args.no_memory, progress)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "seed": args.seed,
+                "results": rows,
+            }, f, indent=1)
+
+    if baseline is not None:
+        report = compare(rows, baseline, args.threshold)
+        if report:
+            print()
+            print_rows([dict(row, baseline=f"{row['baseline']:.4f}", seconds=f"{row['seconds']:.4f}")
+                        for row in report],
+                       ["case", "distribution", "jobs", "baseline", "seconds", "ratio", "regression"])
+        if any(row["regression"] for row in report):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
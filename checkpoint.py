@@ -0,0 +1,97 @@
+import gzip
+import os
+import pickle
+import time
+import zlib
+
+# Checkpoint file layout: a gzip stream of MAGIC followed by one pickled
+# dict, with the engine loop state under "engine" (see engine.iter_policy)
+# and whatever the attached sources add, e.g. the metric accumulators and
+# how far the output files got. The arrays in it (remaining and completion
+# times) pickle as raw bytes. Checkpoints are pickles, only load ones you
+# wrote yourself.
+MAGIC = b"CPUCKPT1"
+
+# Engine events between two looks at the wall clock
+STEPS = 10000
+
+# Later than any simulated time, check_at and steps when there is no
+# interval of that kind
+NEVER = 2 ** 63
+
+
+class Checkpointer:
+    # Saves a run to path every every_time units of simulated time and/or
+    # every every_seconds of wall time. A save goes to a temporary file that
+    # then replaces the previous checkpoint, so a crash in the middle of one
+    # leaves the last complete checkpoint in place.
+    def __init__(self, path, every_time=None, every_seconds=None):
+        if every_time is None and every_seconds is None:
+            raise ValueError("Checkpoint needs a simulated or wall time interval")
+        if (every_time is not None and every_time <= 0) or \
+           (every_seconds is not None and every_seconds <= 0):
+            raise ValueError("Checkpoint intervals must be positive")
+        self.path = path
+        self.every_time = every_time
+        self.every_seconds = every_seconds
+        self.sources = []
+        self.saves = 0
+        self.check_at = NEVER  # Simulated time of the next check
+        self.steps = NEVER if every_seconds is None else STEPS
+        self.saved_at = time.monotonic()
+
+    def attach(self, source):
+        # source() returns a dict that is saved along with the engine state
+        self.sources.append(source)
+
+    def start(self, now):
+        # The engine starts, or resumes, at simulated time now
+        if self.every_time is not None:
+            self.check_at = (now // self.every_time + 1) * self.every_time
+        self.saved_at = time.monotonic()
+        return self.check_at
+
+    def due(self, now):
+        # One save per interval however many of them an idle jump skips
+        due = False
+        if now >= self.check_at:
+            self.check_at = (now // self.every_time + 1) * self.every_time
+            due = True
+        if self.every_seconds is not None and time.monotonic() - self.saved_at >= self.every_seconds:
+            due = True
+        return due
+
+    def save(self, engine_state):
+        state = {"engine": engine_state}
+        for source in self.sources:
+            state.update(source())
+        temporary = self.path + ".tmp"
+        with open(temporary, "wb") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=1) as f:
+                f.write(MAGIC)
+                pickle.dump(state, f, pickle.HIGHEST_PROTOCOL)
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(temporary, self.path)
+        self.saves += 1
+        self.saved_at = time.monotonic()
+
+
+def load(path):
+    # The dict a Checkpointer saved
+    try:
+        with gzip.open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path}: not a checkpoint file")
+            return pickle.load(f)
+    except (gzip.BadGzipFile, EOFError, pickle.UnpicklingError) as e:
+        raise ValueError(f"{path}: not a checkpoint file or truncated ({e})") from None
+
+
+def fingerprint(workload):
+    # Size and CRC of the workload columns, so a checkpoint is never
+    # resumed on a different workload
+    crc = 0
+    for column in (workload.pid, workload.arrival, workload.burst, workload.priority):
+        crc = zlib.crc32(column, crc)
+    return len(workload), crc
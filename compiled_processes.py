@@ -1,4 +1,12 @@
+from itertools import islice
+
+import engine
+import metrics
+
 class Process:
+    __slots__ = ("pid", "arrival_time", "burst_time", "priority", "remaining_time",
+                 "completion_time", "turnaround_time", "waiting_time")
+
     def __init__(self, pid, arrival_time, burst_time, priority=None):
         self.pid = f"P{pid}"
         self.arrival_time = arrival_time
@@ -47,139 +55,91 @@ def print_table(processes):
         print("|" + "|".join(f" {val.center(w)} " for val, w in zip(row, widths)) + "|")
     print(separator)
 
+# Segments per Gantt chart row, longer logs wrap onto further rows
+GANTT_ROW = 16
+
 def print_gantt_chart(execution_log):
+    # Works on any iterable of [pid, start, end], including the engine
+    # streams, and only holds one row of segments at a time
     print("\nGantt Chart:")
-    
-    # Print the top border
-    border = "+" + "+".join("-" * 6 for _ in execution_log) + "+"
-    print(border)
-    
-    # Print process names
-    for entry in execution_log:
-        print(f"|  {entry[0]}  ", end="")
-    print("|")
-    
-    # Print bottom border
-    print(border)
-    
-    # Print time markers
-    print(f"{execution_log[0][1]:<3}", end="")
-    for entry in execution_log:
-        print(f"{entry[2]:<6}", end="")
-    print()
+    segments = iter(execution_log)
+    while True:
+        row = list(islice(segments, GANTT_ROW))
+        if not row:
+            break
+        
+        # Print the top border
+        border = "+" + "+".join("-" * 6 for _ in row) + "+"
+        print(border)
+        
+        # Print process names
+        for entry in row:
+            print(f"|  {entry[0]}  ", end="")
+        print("|")
+        
+        # Print bottom border
+        print(border)
+        
+        # Print time markers
+        print(f"{row[0][1]:<3}", end="")
+        for entry in row:
+            print(f"{entry[2]:<6}", end="")
+        print()
 
-def calculate_metrics(processes):
-    total_tat = sum(p.turnaround_time for p in processes)
-    total_wt = sum(p.waiting_time for p in processes)
-    avg_tat = total_tat / len(processes)
-    avg_wt = total_wt / len(processes)
+def calculate_metrics(processes, execution_log=None):
+    # Single pass, so processes can also be a generator. With the execution
+    # log the tail report includes response times as well.
+    first_start = {}
+    for pid, start, _ in execution_log or ():
+        first_start.setdefault(pid, start)
+    run = metrics.RunMetrics()
+    count = total_tat = total_wt = 0
+    for p in processes:
+        count += 1
+        total_tat += p.turnaround_time
+        total_wt += p.waiting_time
+        run.add_job(p.arrival_time, p.burst_time, p.completion_time, first_start.get(p.pid))
+    avg_tat = total_tat / count
+    avg_wt = total_wt / count
     
     print(f"\nTotal Turnaround Time: {total_tat}")
     print(f"Average Turnaround Time: {avg_tat:.2f}")
     print(f"Total Waiting Time: {total_wt}")
     print(f"Average Waiting Time: {avg_wt:.2f}")
+    metrics.print_report(run)
 
-def sjn_scheduling(processes):
-    current_time = 0
-    completed = []
-    execution_log = []
-    processes_copy = processes.copy()
-    
-    while len(completed) < len(processes):
-        ready_queue = [p for p in processes_copy if p.arrival_time <= current_time and p not in completed]
-        
-        if ready_queue:
-            next_process = min(ready_queue, key=lambda x: x.burst_time)
-            start_time = current_time
-            current_time += next_process.burst_time
-            next_process.completion_time = current_time
-            next_process.turnaround_time = next_process.completion_time - next_process.arrival_time
-            next_process.waiting_time = next_process.turnaround_time - next_process.burst_time
-            execution_log.append([next_process.pid, start_time, current_time])
-            completed.append(next_process)
-        else:
-            current_time += 1
-    
-    return execution_log
-
-def round_robin_scheduling(processes, time_quantum):
-    current_time = 0
-    execution_log = []
-    processes.sort(key=lambda p: p.arrival_time)  # Sort by arrival time
-    ready_queue = []
-    remaining_processes = processes.copy()
+# Every scheduler takes an optional probe.Probe that counts dispatches,
+# ready queue operations, preemptions, context switches, idle jumps and
+# engine loop iterations (see probe.COUNTERS), and fires its
+# dispatch/preempt/complete/idle callbacks. tie_break is "index" (the
+# process listed first wins a tie), "arrival" or "hungry" (see
+# engine.TIE_BREAKS).
 
-    while remaining_processes or ready_queue:
-        if ready_queue:  # Check if the ready queue is not empty
-            current_process = ready_queue.pop(0)  # Get first process (FIFO)
-            
-            # Execute process for time quantum
-            execution_time = min(time_quantum, current_process.remaining_time)
-            current_time += execution_time
-            current_process.remaining_time -= execution_time
+def sjn_scheduling(processes, probe=None, tie_break="index"):
+    # Shortest burst first
+    return engine.schedule(processes, "SJN", probe, tie_break=tie_break)
 
-            # Log execution
-            execution_log.append([current_process.pid, current_time - execution_time, current_time])
+def round_robin_scheduling(processes, time_quantum, probe=None, tie_break="index"):
+    # FIFO by arrival time, each process runs for at most one time quantum
+    return engine.schedule(processes, "RR", probe, time_quantum=time_quantum, tie_break=tie_break)
 
-            # Add newly arrived processes to the ready queue
-            i = 0
-            while i < len(remaining_processes):
-                if remaining_processes[i].arrival_time <= current_time:
-                    ready_queue.append(remaining_processes[i])
-                    remaining_processes.pop(i)
-                else:
-                    i += 1
+def priority_scheduling(processes, preemptive=False, probe=None, aging_rate=0, tie_break="index"):
+    # Lowest priority number first; when preemptive, a newly arrived process
+    # can take over the CPU. With aging_rate a waiting process gains that
+    # many priority levels per time unit.
+    return engine.schedule(processes, "PP" if preemptive else "NP", probe,
+                           aging_rate=aging_rate, tie_break=tie_break)
 
-            # Requeue the process if it still has remaining time
-            if current_process.remaining_time > 0:
-                ready_queue.append(current_process)
-            else:
-                current_process.completion_time = current_time
-                current_process.turnaround_time = current_process.completion_time - current_process.arrival_time
-                current_process.waiting_time = current_process.turnaround_time - current_process.burst_time
-        else:
-            # If ready queue is empty, move to the next arrival time
-            current_time = remaining_processes[0].arrival_time
-            ready_queue.append(remaining_processes.pop(0))
+def srtf_scheduling(processes, probe=None, tie_break="index"):
+    # Least remaining burst first, a new arrival that needs less time than
+    # the running process has left takes over the CPU
+    return engine.schedule(processes, "SRTF", probe, tie_break=tie_break)
 
-    return execution_log
-
-def priority_scheduling(processes, preemptive=False):
-    current_time = 0
-    execution_log = []
-    completed = 0
-    
-    while completed < len(processes):
-        highest_priority_process = None
-        for process in processes:
-            if (process.arrival_time <= current_time and 
-                (process.remaining_time if preemptive else process.completion_time == 0)):
-                if highest_priority_process is None or process.priority < highest_priority_process.priority:
-                    highest_priority_process = process
-        
-        if highest_priority_process:
-            if preemptive:
-                execution_log.append([highest_priority_process.pid, current_time, current_time + 1])
-                highest_priority_process.remaining_time -= 1
-                current_time += 1
-                
-                if highest_priority_process.remaining_time == 0:
-                    highest_priority_process.completion_time = current_time
-                    highest_priority_process.turnaround_time = current_time - highest_priority_process.arrival_time
-                    highest_priority_process.waiting_time = highest_priority_process.turnaround_time - highest_priority_process.burst_time
-                    completed += 1
-            else:
-                execution_log.append([highest_priority_process.pid, current_time, 
-                                   current_time + highest_priority_process.burst_time])
-                current_time += highest_priority_process.burst_time
-                highest_priority_process.completion_time = current_time
-                highest_priority_process.turnaround_time = current_time - highest_priority_process.arrival_time
-                highest_priority_process.waiting_time = highest_priority_process.turnaround_time - highest_priority_process.burst_time
-                completed += 1
-        else:
-            current_time += 1
-    
-    return execution_log
+def mlfq_scheduling(processes, quanta=engine.MLFQ_QUANTA, boost_interval=engine.MLFQ_BOOST,
+                    probe=None):
+    # Round Robin on several levels, a process that uses its whole quantum
+    # drops a level, and every boost_interval all of them go back to the top
+    return engine.schedule(processes, "MLFQ", probe, quanta=quanta, boost_interval=boost_interval)
 
 def get_user_input(algorithm):
     while True:
@@ -203,7 +163,7 @@ def get_user_input(algorithm):
                     continue
                 
                 priority = None
-                if algorithm != "SJN":
+                if algorithm not in engine.NO_PRIORITY_ALGORITHMS:
                     priority = int(input("Priority: "))
                     if priority <= 0:
                         print("Priority must be > 0")
@@ -232,22 +192,24 @@ def main():
     print("2. Round Robin (RR)")
     print("3. Non-preemptive Priority")
     print("4. Preemptive Priority")
-    print("5. Exit")
+    print("5. Shortest Remaining Time First (SRTF)")
+    print("6. Multi-level Feedback Queue (MLFQ)")
+    print("7. Exit")
     
     while True:
         try:
-            choice = int(input("\nSelect an algorithm (1-5): "))
-            if 1 <= choice <= 5:
+            choice = int(input("\nSelect an algorithm (1-7): "))
+            if 1 <= choice <= 7:
                 break
-            print("Invalid choice. Please select 1-5.")
+            print("Invalid choice. Please select 1-7.")
         except ValueError:
-            print("Invalid input. Please enter a number between 1-5.")
+            print("Invalid input. Please enter a number between 1-7.")
     
-    if choice == 5:
+    if choice == 7:
         print("Exiting program.")
         return
     
-    algorithm = {1: "SJN", 2: "RR", 3: "NP", 4: "PP"}[choice]
+    algorithm = {1: "SJN", 2: "RR", 3: "NP", 4: "PP", 5: "SRTF", 6: "MLFQ"}[choice]
     processes, time_quantum = get_user_input(algorithm)
     
     print("\nInitial Process Details:")
@@ -259,13 +221,17 @@ def main():
         execution_log = round_robin_scheduling(processes, time_quantum)
     elif algorithm == "NP":
         execution_log = priority_scheduling(processes, preemptive=False)
-    else:  # PP
+    elif algorithm == "PP":
         execution_log = priority_scheduling(processes, preemptive=True)
+    elif algorithm == "SRTF":
+        execution_log = srtf_scheduling(processes)
+    else:  # MLFQ
+        execution_log = mlfq_scheduling(processes)
     
     print("\nFinal Process Details:")
     print_table(processes)
     print_gantt_chart(execution_log)
-    calculate_metrics(processes)
+    calculate_metrics(processes, execution_log)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,142 +1,29 @@
+import multiprocessing
+import queue
+import threading
+from array import array
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from typing import List
+import batch
 import compiled_processes
+import engine
+import gantt
+import loader
+import metrics
+import tracefile
+from table import VirtualTable
+from workload import JobSpec, Result, Workload
 
-# Import the scheduling functions from your original code
-def sjn_scheduling(processes):
-    current_time = 0
-    completed = []
-    execution_log = []
-    processes_copy = processes.copy()
-    
-    while len(completed) < len(processes):
-        ready_queue = [p for p in processes_copy if p.arrival_time <= current_time and p not in completed]
-        
-        if ready_queue:
-            next_process = min(ready_queue, key=lambda x: x.burst_time)
-            start_time = current_time
-            current_time += next_process.burst_time
-            next_process.completion_time = current_time
-            next_process.turnaround_time = next_process.completion_time - next_process.arrival_time
-            next_process.waiting_time = next_process.turnaround_time - next_process.burst_time
-            execution_log.append([next_process.pid, start_time, current_time])
-            completed.append(next_process)
-        else:
-            current_time += 1
-    
-    return execution_log
-
-def round_robin_scheduling(processes, time_quantum):
-    current_time = 0
-    execution_log = []
-    processes.sort(key=lambda p: p.arrival_time)  # Sort by arrival time
-    ready_queue = []
-    remaining_processes = processes.copy()
-
-    while remaining_processes or ready_queue:
-        if ready_queue:  # Check if the ready queue is not empty
-            current_process = ready_queue.pop(0)  # Get first process (FIFO)
-            
-            # Execute process for time quantum
-            execution_time = min(time_quantum, current_process.remaining_time)
-            current_time += execution_time
-            current_process.remaining_time -= execution_time
-
-            # Log execution
-            execution_log.append([current_process.pid, current_time - execution_time, current_time])
-
-            # Add newly arrived processes to the ready queue
-            i = 0
-            while i < len(remaining_processes):
-                if remaining_processes[i].arrival_time <= current_time:
-                    ready_queue.append(remaining_processes[i])
-                    remaining_processes.pop(i)
-                else:
-                    i += 1
-
-            # Requeue the process if it still has remaining time
-            if current_process.remaining_time > 0:
-                ready_queue.append(current_process)
-            else:
-                current_process.completion_time = current_time
-                current_process.turnaround_time = current_process.completion_time - current_process.arrival_time
-                current_process.waiting_time = current_process.turnaround_time - current_process.burst_time
-        else:
-            # If ready queue is empty, move to the next arrival time
-            current_time = remaining_processes[0].arrival_time
-            ready_queue.append(remaining_processes.pop(0))
-
-    return execution_log
-
-def priority_scheduling(processes, preemptive=False):
-    current_time = 0
-    execution_log = []
-    completed = 0
-    
-    # For tracking continuous process execution
-    current_process = None
-    start_time = 0
-    
-    while completed < len(processes):
-        highest_priority_process = None
-        for process in processes:
-            if (process.arrival_time <= current_time and 
-                (process.remaining_time if preemptive else process.completion_time == 0)):
-                if highest_priority_process is None or process.priority < highest_priority_process.priority:
-                    highest_priority_process = process
-        
-        if highest_priority_process:
-            if preemptive:
-                # If we have a process switch or first process
-                if current_process != highest_priority_process:
-                    # Log the previous process if it exists
-                    if current_process is not None:
-                        execution_log.append([current_process.pid, start_time, current_time])
-                    # Start tracking new process
-                    current_process = highest_priority_process
-                    start_time = current_time
-                
-                highest_priority_process.remaining_time -= 1
-                current_time += 1
-                
-                if highest_priority_process.remaining_time == 0:
-                    # Log the completed process
-                    execution_log.append([current_process.pid, start_time, current_time])
-                    current_process = None
-                    highest_priority_process.completion_time = current_time
-                    highest_priority_process.turnaround_time = current_time - highest_priority_process.arrival_time
-                    highest_priority_process.waiting_time = highest_priority_process.turnaround_time - highest_priority_process.burst_time
-                    completed += 1
-            else:
-                execution_log.append([highest_priority_process.pid, current_time, 
-                                   current_time + highest_priority_process.burst_time])
-                current_time += highest_priority_process.burst_time
-                highest_priority_process.completion_time = current_time
-                highest_priority_process.turnaround_time = current_time - highest_priority_process.arrival_time
-                highest_priority_process.waiting_time = highest_priority_process.turnaround_time - highest_priority_process.burst_time
-                completed += 1
-        else:
-            current_time += 1
-    
-    # Handle the last process if it exists
-    if current_process is not None and current_process.remaining_time == 0:
-        execution_log.append([current_process.pid, start_time, current_time])
-    
-    return execution_log
-
-class Process:
-    def __init__(self, pid, arrival_time, burst_time, priority=None):
-        self.pid = f"P{pid}"
-        self.arrival_time = arrival_time
-        self.burst_time = burst_time
-        self.priority = priority
-        self.remaining_time = burst_time
-        self.completion_time = 0
-        self.turnaround_time = 0
-        self.waiting_time = 0
+# Segments between progress reports and Cancel checks of a GUI run
+PROGRESS_EVERY = 4096
 
-    
+# Import the scheduling functions from your original code
+sjn_scheduling = compiled_processes.sjn_scheduling
+round_robin_scheduling = compiled_processes.round_robin_scheduling
+priority_scheduling = compiled_processes.priority_scheduling
+srtf_scheduling = compiled_processes.srtf_scheduling
+mlfq_scheduling = compiled_processes.mlfq_scheduling
 
 class CPUSchedulerGUI:
     def __init__(self, root):
@@ -149,27 +36,35 @@ class CPUSchedulerGUI:
         self.root.configure(bg="#A69CAC")
         
         # Variables
-        self.processes: List[Process] = []
+        self.processes: List[JobSpec] = []
         self.current_pid = 0
         self.selected_algorithm = tk.StringVar(value="")
         self.time_quantum = tk.StringVar(value="3")
+        self.hungry = tk.BooleanVar(value=False)
+        self.cancel_event = threading.Event()
+        self.result = None
+        self.result_rows = {}  # pid -> row of self.result
+        self.trace = None  # tracefile.TraceReader shown in the Gantt chart
         
         self.create_widgets()
         
     def create_widgets(self):
 
+        # Bulk input, parsed on a worker thread
+        menubar = tk.Menu(self.root)
+        self.file_menu = file_menu = tk.Menu(menubar, tearoff=0)
+        file_menu.add_command(label="Import Workload...", command=self.import_workload)
+        file_menu.add_command(label="Paste Workload", command=self.paste_workload)
+        file_menu.add_separator()
+        file_menu.add_command(label="Open Trace...", command=self.open_trace)
+        menubar.add_cascade(label="File", menu=file_menu)
+        self.root.config(menu=menubar)
+
         # Algorithm Selection Frame
         algo_frame = ttk.LabelFrame(self.root, text="Algorithm Selection", padding=10)
         algo_frame.pack(fill="x", padx=10, pady=5)
         
-        algorithms = [
-            ("Shortest Job Next", "SJN"),
-            ("Round Robin", "RR"),
-            ("Non-preemptive Priority", "NP"),
-            ("Preemptive Priority", "PP")
-        ]
-        
-        for text, value in algorithms:
+        for value, text in engine.ALGORITHMS.items():
             ttk.Radiobutton(
                 algo_frame, 
                 text=text,
@@ -178,6 +73,9 @@ class CPUSchedulerGUI:
                 command=self.on_algorithm_change
             ).pack(side="left", padx=5)
         
+        # Rule 3 of the RoundRobin.py spec, for every algorithm but MLFQ
+        ttk.Checkbutton(algo_frame, text="Hungry tie-break", variable=self.hungry).pack(side="left", padx=5)
+        
         style = ttk.Style()
         style.configure("TRadiobutton", font=('Helvetica', 14))
         
@@ -202,35 +100,40 @@ class CPUSchedulerGUI:
         ttk.Label(input_frame, text="Priority:").grid(row=0, column=4, padx=5)
         self.priority.grid(row=0, column=5, padx=5)
         
-        ttk.Button(input_frame, text="Add", command=self.add_process).grid(row=0, column=6, padx=(10,0))
-        ttk.Button(input_frame, text="Remove", command=self.remove_process).grid(row=0, column=7, padx=0)
-        ttk.Button(input_frame, text="Clear All", command=self.clear_all).grid(row=0, column=8, padx=0)
-        ttk.Button(input_frame, text="Run", command=self.run_simulation).grid(row=0, column=9, padx=(20,10))
+        # Add, Remove and Clear All, disabled while a run is in flight
+        self.edit_buttons = [
+            ttk.Button(input_frame, text="Add", command=self.add_process),
+            ttk.Button(input_frame, text="Remove", command=self.remove_process),
+            ttk.Button(input_frame, text="Clear All", command=self.clear_all),
+        ]
+        self.edit_buttons[0].grid(row=0, column=6, padx=(10,0))
+        self.edit_buttons[1].grid(row=0, column=7, padx=0)
+        self.edit_buttons[2].grid(row=0, column=8, padx=0)
+        self.run_button = ttk.Button(input_frame, text="Run", command=self.run_simulation)
+        self.run_button.grid(row=0, column=9, padx=(20,0))
+        self.compare_button = ttk.Button(input_frame, text="Compare", command=self.compare_algorithms)
+        self.compare_button.grid(row=0, column=10, padx=0)
+        self.cancel_button = ttk.Button(input_frame, text="Cancel", command=self.cancel_simulation,
+                                        state="disabled")
+        self.cancel_button.grid(row=0, column=11, padx=(0,10))
 
         # Process Table
         table_frame = ttk.LabelFrame(self.root, text="Processes", padding=10)
         table_frame.pack(fill="x", expand=True, padx=10, pady=5)
 
-        # Create a frame with fixed height for the treeview
-        tree_container = ttk.Frame(table_frame)  # Reduced height
-        tree_container.pack(fill="x", expand=False)
-        tree_container.pack_propagate(False)  # Prevent the frame from shrinking
-        
-        # Treeview for processes
+        # Treeview for processes. Only the rows on screen exist as Treeview
+        # items, their values come from table_row()
         columns = ("PID", "Arrival Time", "Burst Time", "Priority", 
                   "Completion Time", "Turnaround Time", "Waiting Time")
-        self.tree = ttk.Treeview(table_frame, columns=columns, show="headings")
-        
-        # Add scrollbar for treeview
-        tree_scrollbar = ttk.Scrollbar(tree_container, orient="vertical", command=self.tree.yview)
-        self.tree.configure(yscrollcommand=tree_scrollbar.set)
+        self.table = VirtualTable(table_frame, columns, self.table_row)
+        self.tree = self.table.tree
 
         for col in columns:
             self.tree.heading(col, text=col)
             self.tree.column(col, width=100)
         
+        self.table.scrollbar.pack(side="right", fill="y")
         self.tree.pack(fill="both", expand=True)
-        tree_scrollbar.pack(side="right", fill="y")
         
         
         # Gantt Chart Frame
@@ -240,9 +143,10 @@ class CPUSchedulerGUI:
         chart_container = ttk.Frame(self.gantt_frame)
         chart_container.pack(fill="x", expand=True)
         
+        # Mouse wheel zooms, Shift + wheel and the scrollbar scroll
         self.gantt_canvas = tk.Canvas(chart_container, height=120, bg="white")
-        gantt_scrollbar = ttk.Scrollbar(chart_container, orient="horizontal", command=self.gantt_canvas.xview)
-        self.gantt_canvas.configure(xscrollcommand=gantt_scrollbar.set)
+        gantt_scrollbar = ttk.Scrollbar(chart_container, orient="horizontal")
+        self.gantt_view = gantt.GanttView(self.gantt_canvas, gantt_scrollbar)
         self.gantt_canvas.pack(fill="x", expand=True, padx=10)
         gantt_scrollbar.pack(fill="x")
 
@@ -260,12 +164,29 @@ class CPUSchedulerGUI:
         self.avg_wt_label = ttk.Label(self.metrics_frame, text="Average Waiting Time: ", font=metrics_font)
         self.avg_wt_label.pack(anchor="w", padx=5, pady=2)
 
-    def update_metrics(self, avg_tat, avg_wt):
+        # Tail percentiles, response time, slowdown and throughput
+        self.tail_label = ttk.Label(self.metrics_frame, text="")
+        self.tail_label.pack(anchor="w", padx=5, pady=2)
+
+        # Progress of a running simulation
+        self.progress_label = ttk.Label(self.metrics_frame, text="")
+        self.progress_label.pack(anchor="w", padx=5, pady=2)
+
+    def update_metrics(self, avg_tat, avg_wt, report=None):
         self.avg_tat_label.config(text=f"Average Turnaround Time: {avg_tat:.2f}")
         self.avg_wt_label.config(text=f"Average Waiting Time: {avg_wt:.2f}")
+        if report is None:
+            self.tail_label.config(text="")
+            return
+        self.tail_label.config(text=(
+            f"Waiting Time p50/p95/p99/max: {report['p50_wt']}/{report['p95_wt']}/"
+            f"{report['p99_wt']}/{report['max_wt']}    "
+            f"Response Time p95/p99/max: {report['p95_rt']}/{report['p99_rt']}/{report['max_rt']}\n"
+            f"Slowdown avg/p99: {report['avg_slowdown']:.2f}/{report['p99_slowdown']:.2f}    "
+            f"Throughput: {report['throughput']:.4f} jobs per time unit"))
         
     def on_algorithm_change(self):
-        if self.selected_algorithm.get() == "SJN":
+        if self.selected_algorithm.get() in engine.NO_PRIORITY_ALGORITHMS:
             self.priority.config(state="disabled")
             self.tq_frame.pack_forget()
         elif self.selected_algorithm.get() == "RR":
@@ -279,19 +200,14 @@ class CPUSchedulerGUI:
         try:
             arrival = int(self.arrival_time.get())
             burst = int(self.burst_time.get())
-            priority = None if self.selected_algorithm.get() == "SJN" else int(self.priority.get())
+            priority = None if self.selected_algorithm.get() in engine.NO_PRIORITY_ALGORITHMS else int(self.priority.get())
             
             if arrival < 0 or burst <= 0 or (priority is not None and priority <= 0):
                 raise ValueError("Invalid input values")
             
-            process = Process(self.current_pid, arrival, burst, priority)
+            process = JobSpec(f"P{self.current_pid}", arrival, burst, priority)
             self.processes.append(process)
-            
-            self.tree.insert("", "end", values=(
-                process.pid, arrival, burst, 
-                priority if priority is not None else "N/A",
-                0, 0, 0
-            ))
+            self.table.set_count(len(self.processes), follow=True)
             
             self.current_pid += 1
             self.clear_inputs()
@@ -299,126 +215,301 @@ class CPUSchedulerGUI:
         except ValueError as e:
             messagebox.showerror("Error", "Please enter valid numeric values")
     
+    def import_workload(self):
+        path = filedialog.askopenfilename(
+            title="Import Workload",
+            filetypes=[("Workloads", "*.csv *.jsonl *.json *.ndjson"), ("All files", "*")])
+        if path:
+            algorithm = self.selected_algorithm.get()
+            self.load_jobs(lambda: loader.load_workload(path, algorithm))
+
+    def paste_workload(self):
+        try:
+            text = self.root.clipboard_get()
+        except tk.TclError:
+            messagebox.showwarning("Warning", "The clipboard is empty!")
+            return
+        algorithm = self.selected_algorithm.get()
+        self.load_jobs(lambda: loader.parse_workload(text, algorithm))
+
+    def load_jobs(self, load):
+        # Rows are parsed and checked on a worker thread with the add_process
+        # rules (priority is only optional for SJN), then added in one batch.
+        # Imported jobs get new pids after the existing ones.
+        results = queue.Queue()
+
+        def worker():
+            try:
+                results.put(load())
+            except Exception as e:
+                results.put(e)
+
+        threading.Thread(target=worker, daemon=True).start()
+        self.root.after(100, self.poll_load, results)
+
+    def poll_load(self, results):
+        try:
+            workload = results.get_nowait()
+        except queue.Empty:
+            self.root.after(100, self.poll_load, results)
+            return
+
+        if isinstance(workload, Exception):
+            messagebox.showerror("Error", f"Import failed: {str(workload)}")
+            return
+        if not len(workload):
+            messagebox.showwarning("Warning", "No processes found!")
+            return
+        first = self.current_pid
+        self.processes.extend(
+            JobSpec(f"P{first + i}", job.arrival_time, job.burst_time, job.priority)
+            for i, job in enumerate(workload))
+        self.current_pid += len(workload)
+        self.table.set_count(len(self.processes), follow=True)
+
     def clear_inputs(self):
         self.arrival_time.delete(0, "end")
         self.burst_time.delete(0, "end")
         self.priority.delete(0, "end")
 
     def remove_process(self):
-        selected_item = self.tree.selection()
-        if selected_item:
-            index = self.tree.index(selected_item)
+        index = self.table.selected
+        if index is not None:
             self.processes.pop(index)
-            self.tree.delete(selected_item)
+            self.table.set_count(len(self.processes))
     
     def clear_all(self):
         self.processes.clear()
         self.current_pid = 0
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        self.gantt_canvas.delete("all")
+        self.result = None
+        self.result_rows = {}
+        self.table.set_count(0)
+        self.draw_gantt_chart([])
     
-    def update_table(self):
-        for item in self.tree.get_children():
-            process = next(p for p in self.processes if p.pid == self.tree.item(item)["values"][0])
-            self.tree.item(item, values=(
-                process.pid, process.arrival_time, process.burst_time,
-                process.priority if process.priority is not None else "N/A",
-                process.completion_time, process.turnaround_time, process.waiting_time
-            ))
+    def table_row(self, index):
+        # Values of table row index. Results are found through the pid index
+        # of the last run, so rows added or removed since then keep lining up.
+        job = self.processes[index]
+        row = (job.pid, job.arrival_time, job.burst_time,
+               job.priority if job.priority is not None else "N/A")
+        i = self.result_rows.get(job.pid)
+        if i is None:
+            return row + (0, 0, 0)
+        completion = self.result.completion[i]
+        turnaround = completion - job.arrival_time
+        return row + (completion, turnaround, turnaround - job.burst_time)
     
-    def draw_gantt_chart(self, execution_log):
-        self.gantt_canvas.delete("all")
-        
-        if not execution_log:
+    def update_table(self, result, result_rows):
+        # result_rows maps pid -> row of result, only the visible rows are
+        # refreshed
+        self.result = result
+        self.result_rows = result_rows
+        self.table.refresh()
+    
+    def draw_gantt_chart(self, execution_log, view=None):
+        # The view draws only what is on screen and redraws by itself on
+        # resize, scroll and zoom
+        if view is None and self.trace is not None:
+            self.trace.close()
+            self.trace = None
+        (view or self.gantt_view).show(execution_log)
+
+    def open_trace(self):
+        # An archived run (batch.py run --trace) in the main Gantt chart,
+        # read from the file as the chart needs it
+        path = filedialog.askopenfilename(
+            title="Open Trace", filetypes=[("Traces", "*.trace *.trc *.bin"), ("All files", "*")])
+        if not path:
             return
-            
-        # Calculate dimensions
-        canvas_width = self.gantt_canvas.winfo_width()
-        canvas_height = self.gantt_canvas.winfo_height()
-        total_time = execution_log[-1][2]  # End time of last process
-        
-        # Fixed block width calculation
-        min_block_width = 50  # Minimum width for each time unit
-        required_width = total_time * min_block_width
-        scale_factor = min(1, canvas_width / required_width)
-        block_width = min_block_width * scale_factor
-        
-        # Center the chart
-        start_x = (canvas_width - (total_time * block_width)) / 2
-        block_height = 40
-        y_pos = canvas_height - 30
-        y_top = y_pos - block_height
-        
-        # Draw timeline
-        timeline_start = start_x
-        timeline_end = start_x + (total_time * block_width)
-        self.gantt_canvas.create_line(timeline_start, y_pos, timeline_end, y_pos, fill="black")
-        
-        # Draw process blocks
-        for process_id, start_time, end_time in execution_log:
-            x1 = start_x + (start_time * block_width)
-            x2 = start_x + (end_time * block_width)
-            
-            # Draw block with border
-            self.gantt_canvas.create_rectangle(x1, y_top, x2, y_pos, 
-                                            fill="lightblue", outline="black")
-            self.gantt_canvas.create_text((x1+x2)/2, (y_top+y_pos)/2, 
-                                        text=process_id)
-            
-            # Draw time markers
-            self.gantt_canvas.create_line(x1, y_pos, x1, y_pos+5)
-            self.gantt_canvas.create_text(x1, y_pos+15, text=str(start_time))
-        
-        # Draw final time marker
-        self.gantt_canvas.create_line(timeline_end, y_pos, timeline_end, y_pos+5)
-        self.gantt_canvas.create_text(timeline_end, y_pos+15, text=str(total_time))
+        try:
+            reader = tracefile.TraceReader(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Open failed: {str(e)}")
+            return
+        self.draw_gantt_chart(reader.gantt_log())
+        self.trace = reader
     
     def run_simulation(self):
         if not self.processes:
             messagebox.showwarning("Warning", "No processes to simulate!")
             return
         
-        # Reset process states
-        for process in self.processes:
-            process.remaining_time = process.burst_time
-            process.completion_time = 0
-            process.turnaround_time = 0
-            process.waiting_time = 0
-        
         algorithm = self.selected_algorithm.get()
-        execution_log = []
+        if not algorithm:
+            messagebox.showwarning("Warning", "Please select an algorithm!")
+            return
         
-        try:
-            if algorithm == "SJN":
-                execution_log = sjn_scheduling(self.processes)
-            elif algorithm == "RR":
+        params = {}
+        if algorithm == "RR":
+            try:
                 time_quantum = int(self.time_quantum.get())
                 if time_quantum <= 0:
-                    raise ValueError("Time quantum must be positive")
-                execution_log = round_robin_scheduling(self.processes, time_quantum)
-            elif algorithm == "NP":
-                execution_log = priority_scheduling(self.processes, preemptive=False)
-            else:  # PP
-                execution_log = priority_scheduling(self.processes, preemptive=True)
-            
-            self.update_table()
+                    raise ValueError
+            except ValueError:
+                messagebox.showerror("Error", "Please enter a valid time quantum")
+                return
+            params["time_quantum"] = time_quantum
+        if self.hungry.get() and algorithm != "MLFQ":
+            params["tie_break"] = "hungry"
+
+        # The engine runs on a worker thread so the window keeps responding.
+        # It reports progress through a queue polled with after(), checks
+        # for Cancel between segments, and the finished Result is swapped in
+        # at the end. The job specs are never modified, so there is nothing
+        # to reset.
+        jobs = list(self.processes)
+        workload = Workload.from_processes(jobs)
+        messages = queue.Queue()
+        self.cancel_event = threading.Event()
+
+        def worker():
+            try:
+                completion = array("q", bytes(8 * len(workload)))
+                run = metrics.RunMetrics()
+                segments = engine.stream(workload, algorithm, completion, **params)
+                log = []
+                for count, segment in enumerate(metrics.track(segments, workload, completion, run)):
+                    log.append(segment)
+                    if not count % PROGRESS_EVERY:
+                        if self.cancel_event.is_set():
+                            segments.close()
+                            messages.put(("cancelled",))
+                            return
+                        messages.put(("progress", segment[2], len(run)))
+                result = Result(workload, algorithm, params, completion, log)
+                result_rows = {job.pid: i for i, job in enumerate(jobs)}
+                messages.put(("done", result, result_rows, result.pid_log(), run.report()))
+            except Exception as e:
+                messages.put(("error", e))
+
+        self.set_running(True)
+        threading.Thread(target=worker, daemon=True).start()
+        self.root.after(100, self.poll_simulation, messages, len(workload))
+
+    def set_running(self, running, cancellable=True):
+        # Run and Compare wait for the current run or comparison, and the
+        # process list cannot be edited under it (a Clear All would hand
+        # its pids to new processes that then show the old results). Cancel
+        # only works during a run.
+        state = "disabled" if running else "normal"
+        self.run_button.config(state=state)
+        self.compare_button.config(state=state)
+        self.cancel_button.config(state="normal" if running and cancellable else "disabled")
+        for button in self.edit_buttons:
+            button.config(state=state)
+        for label in ("Import Workload...", "Paste Workload"):
+            self.file_menu.entryconfig(label, state=state)
+        if not running:
+            self.progress_label.config(text="")
+
+    def cancel_simulation(self):
+        self.cancel_event.set()
+
+    def poll_simulation(self, messages, jobs):
+        # Only the latest progress message is shown, older ones are dropped
+        message = None
+        while True:
+            try:
+                message = messages.get_nowait()
+            except queue.Empty:
+                break
+            if message[0] != "progress":
+                break
+
+        if message is None or message[0] == "progress":
+            if message is not None:
+                self.progress_label.config(
+                    text=f"Simulated time: {message[1]}    Jobs completed: {message[2]} / {jobs}")
+            self.root.after(100, self.poll_simulation, messages, jobs)
+            return
+
+        self.set_running(False)
+        if message[0] == "error":
+            messagebox.showerror("Error", f"Simulation failed: {str(message[1])}")
+        elif message[0] == "done":
+            _, result, result_rows, execution_log, report = message
+            self.update_table(result, result_rows)
             self.draw_gantt_chart(execution_log)
-            
-            # Calculate and show metrics
-            total_tat = sum(p.turnaround_time for p in self.processes)
-            total_wt = sum(p.waiting_time for p in self.processes)
-            avg_tat = total_tat / len(self.processes)
-            avg_wt = total_wt / len(self.processes)
+            self.update_metrics(result.average_turnaround(), result.average_waiting(), report)
 
-            self.update_metrics(avg_tat, avg_wt)
-            
-            #messagebox.showinfo("Results", 
-               # f"Average Turnaround Time: {avg_tat:.2f}\n"
-                #f"Average Waiting Time: {avg_wt:.2f}")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Simulation failed: {str(e)}")
+    def compare_algorithms(self):
+        if not self.processes:
+            messagebox.showwarning("Warning", "No processes to simulate!")
+            return
+        try:
+            time_quantum = int(self.time_quantum.get())
+            if time_quantum <= 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Error", "Please enter a valid time quantum")
+            return
+
+        # Every algorithm runs in its own worker process. The pool is driven
+        # from a thread and polled with after() so the window keeps
+        # responding. Workers are spawned, not forked, because forking a
+        # process that has Tk open is not safe.
+        workload = Workload.from_processes(self.processes)
+        tie_break = "hungry" if self.hungry.get() else "index"
+        results = queue.Queue()
+
+        def worker():
+            try:
+                results.put(batch.compare_algorithms(
+                    workload, time_quantum=time_quantum,
+                    mp_context=multiprocessing.get_context("spawn"), tie_break=tie_break))
+            except Exception as e:
+                results.put(e)
+
+        self.set_running(True, cancellable=False)
+        threading.Thread(target=worker, daemon=True).start()
+        self.root.after(100, self.poll_comparison, results)
+
+    def poll_comparison(self, results):
+        try:
+            report = results.get_nowait()
+        except queue.Empty:
+            self.root.after(100, self.poll_comparison, results)
+            return
+
+        self.set_running(False)
+        if isinstance(report, Exception):
+            messagebox.showerror("Error", f"Comparison failed: {str(report)}")
+            return
+        self.show_comparison(report)
+
+    def show_comparison(self, report):
+        window = tk.Toplevel(self.root)
+        window.title("Algorithm Comparison")
+        window.geometry("820x320")
+        notebook = ttk.Notebook(window)
+        notebook.pack(fill="both", expand=True, padx=10, pady=10)
+
+        # Summary tab with the metrics of every algorithm side by side
+        summary = ttk.Frame(notebook, padding=10)
+        notebook.add(summary, text="Summary")
+        columns = ["algorithm"] + batch.METRIC_COLUMNS
+        table = ttk.Treeview(summary, columns=columns, show="headings")
+        for col in columns:
+            table.heading(col, text=col)
+            table.column(col, width=70)
+        for row in report:
+            table.insert("", "end", values=[
+                f"{row[col]:.2f}" if isinstance(row[col], float) else row[col] for col in columns
+            ])
+        table.pack(fill="both", expand=True)
+
+        # One Gantt chart tab per algorithm, drawn once the tab has a size
+        for row in report:
+            tab = ttk.Frame(notebook, padding=10)
+            notebook.add(tab, text=engine.ALGORITHMS[row["algorithm"]])
+            canvas = tk.Canvas(tab, height=120, bg="white")
+            scrollbar = ttk.Scrollbar(tab, orient="horizontal")
+            canvas.pack(fill="x", expand=True)
+            scrollbar.pack(fill="x")
+            ttk.Label(tab, text=f"Average Turnaround Time: {row['avg_tat']:.2f}    "
+                                f"Average Waiting Time: {row['avg_wt']:.2f}    "
+                                f"Context Switches: {row['context_switches']}").pack(anchor="w", pady=5)
+            self.draw_gantt_chart(row["result"].pid_log(), gantt.GanttView(canvas, scrollbar))
 
 def main():
     root = tk.Tk()
@@ -0,0 +1,605 @@
+import argparse
+import contextlib
+import importlib.util
+import io
+import os
+import random
+import sys
+from collections import deque
+from fractions import Fraction
+from itertools import count
+
+import compiled_processes
+import engine
+from workload import Workload
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_script(filename):
+    # The standalone scripts are not importable by name (one has a space in
+    # it), load them from their file
+    name = os.path.splitext(filename)[0].replace(" ", "_")
+    spec = importlib.util.spec_from_file_location(name, os.path.join(HERE, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# A workload here is a list of (arrival, burst, priority) tuples, job i has
+# pid i. Every adapter below runs one implementation on fresh objects and
+# returns (execution log or None, completion times in job order); the log
+# uses pids as given by the implementation ("P3" or 3). The standalone
+# scripts have their own fixed tie-breaks and ignore tie_break: "arrival"
+# for SJN.py and the priority scripts, "hungry" for RoundRobin.py. They are
+# checked in groups of their own, against the engine with that tie-break.
+
+
+def _processes(module_process, jobs):
+    return [module_process(i, a, b, p) for i, (a, b, p) in enumerate(jobs)]
+
+
+def _completion(processes):
+    return [p.completion_time for p in processes]
+
+
+def _mlfq_params(quantum):
+    # MLFQ settings of a trial, from its time quantum: two levels and a
+    # boost interval short enough for boosts to happen in small workloads
+    return {"quanta": (quantum, quantum + 1), "boost_interval": 5 * quantum}
+
+
+def _aging_params(quantum):
+    # Aging rate of a trial, from its time quantum: 1/3, 2/3, 1 or 4/3
+    # priority levels per time unit
+    return {"aging_rate": Fraction(quantum, 3)}
+
+
+def _compiled(module, function, *args, params=None):
+    # params(quantum), if given, gives further keyword arguments
+    def run(jobs, quantum, tie_break):
+        processes = _processes(compiled_processes.Process, jobs)
+        extra = (quantum,) if function == "round_robin_scheduling" else args
+        kwargs = params(quantum) if params else {}
+        if tie_break != "index":
+            kwargs["tie_break"] = tie_break
+        log = getattr(module, function)(processes, *extra, **kwargs)
+        return log, _completion(processes)
+    return run
+
+
+def _engine(algorithm, params=None, fixed_tie_break=None):
+    # fixed_tie_break, if given, is used whatever tie_break the check runs with
+    def run(jobs, quantum, tie_break):
+        tie_break = fixed_tie_break or tie_break
+        workload = Workload.from_columns(*zip(*jobs))
+        kwargs = params(quantum) if params else {}
+        result = engine.simulate(workload, algorithm, time_quantum=quantum, tie_break=tie_break,
+                                 **kwargs)
+        return [list(segment) for segment in result.execution_log], list(result.completion)
+    return run
+
+
+def _completion_from_log(log, n):
+    completion = [0] * n
+    for pid, _, end in log:
+        j = int(str(pid).lstrip("P"))
+        completion[j] = max(completion[j], end)
+    return completion
+
+
+def _sjn_script(jobs, quantum, tie_break):
+    module = _script("SJN.py")
+    log = module.non_preemptive_sjn([[f"P{i}", a, b] for i, (a, b, _) in enumerate(jobs)])
+    return log, _completion_from_log(log, len(jobs))
+
+
+def _rr_script(jobs, quantum, tie_break):
+    module = _script("RoundRobin.py")
+    with contextlib.redirect_stdout(io.StringIO()):
+        log = module.roundRobin([[f"P{i}", a, b, p] for i, (a, b, p) in enumerate(jobs)], quantum)
+    return log, _completion_from_log(log, len(jobs))
+
+
+def _priority_script(filename, function):
+    # These print their log instead of returning it, only the completion
+    # times are compared
+    def run(jobs, quantum, tie_break):
+        module = _script(filename)
+        processes = _processes(module.Process, jobs)
+        with contextlib.redirect_stdout(io.StringIO()):
+            getattr(module, function)(processes)
+        return None, _completion(processes)
+    return run
+
+
+# References the engine is checked against, none of them shares code with
+# it. They do what the event driven engine skips: step the clock one time
+# unit at a time, or rescan a plain list at every dispatch as the original
+# compiled_processes loops did. Tick-stepped logs get one entry per tick,
+# normalize() merges them.
+
+
+def _ready_key(tie_break, rank, j, arrival, ran=0, seq=0):
+    # Sort key of waiting job j with the given rank, ties broken as in
+    # engine.TIE_BREAKS; seq is its place in the order jobs were queued
+    if tie_break == "hungry":
+        return rank, arrival[j], ran, seq
+    if tie_break == "arrival":
+        return rank, arrival[j], j
+    return rank, j
+
+
+def _outranks(tie_break, rank_k, k, rank_j, j, arrival):
+    # Whether job k, arriving with rank_k, takes the CPU from job j running
+    # with rank_j. For hungry, k has not run yet and j has.
+    if tie_break == "hungry":
+        return (rank_k, arrival[k], 0) < (rank_j, arrival[j], 1)
+    return _ready_key(tie_break, rank_k, k, arrival) < _ready_key(tie_break, rank_j, j, arrival)
+
+
+def _nonpreemptive_list(column):
+    # The original sjn_scheduling and non-preemptive priority_scheduling:
+    # whenever the CPU is free, scan every job for the ready ones and run the
+    # one with the smallest rank (column 1 of the job tuple, the burst, or
+    # column 2, the priority) to completion; step the clock while none is
+    # ready. No waiting job has run yet and jobs are queued in arrival, then
+    # index order, so the index is the queue order hungry goes by.
+    def run(jobs, quantum, tie_break):
+        n = len(jobs)
+        arrival = [a for a, _, _ in jobs]
+        burst = [b for _, b, _ in jobs]
+        rank = [job[column] for job in jobs]
+        log = []
+        completion = [0] * n
+        done = t = 0
+        while done < n:
+            ready = [j for j in range(n) if arrival[j] <= t and not completion[j]]
+            if not ready:
+                t += 1
+                continue
+            j = min(ready, key=lambda j: _ready_key(tie_break, rank[j], j, arrival, 0, j))
+            log.append([j, t, t + burst[j]])
+            t += burst[j]
+            completion[j] = t
+            done += 1
+        return log, completion
+    return run
+
+
+def _rr_list(jobs, quantum, tie_break):
+    # The original round_robin_scheduling: a FIFO list, the first job runs
+    # for at most one quantum, then every job that has arrived meanwhile is
+    # queued ahead of it. Jobs arriving together are queued in index order,
+    # for hungry in priority order.
+    n = len(jobs)
+    arrival = [a for a, _, _ in jobs]
+    remaining = [b for _, b, _ in jobs]
+    if tie_break == "hungry":
+        waiting = sorted(range(n), key=lambda j: (arrival[j], jobs[j][2], j))
+    else:
+        waiting = sorted(range(n), key=lambda j: (arrival[j], j))
+    ready = []
+    log = []
+    completion = [0] * n
+    t = 0
+    while waiting or ready:
+        if not ready:
+            t = max(t, arrival[waiting[0]])
+        while waiting and arrival[waiting[0]] <= t:
+            ready.append(waiting.pop(0))
+        j = ready.pop(0)
+        ran = min(quantum, remaining[j])
+        log.append([j, t, t + ran])
+        t += ran
+        remaining[j] -= ran
+        while waiting and arrival[waiting[0]] <= t:
+            ready.append(waiting.pop(0))
+        if remaining[j]:
+            ready.append(j)
+        else:
+            completion[j] = t
+    return log, completion
+
+
+def _srtf_ticks(jobs, quantum, tie_break):
+    # Each tick the arrivals are queued, the running job is preempted by an
+    # arrival that needs less time than it has left, then the ready job
+    # with the least remaining time runs. Ready jobs keep the key they were
+    # queued with, their remaining time does not change while they wait.
+    n = len(jobs)
+    arrival = [a for a, _, _ in jobs]
+    remaining = [b for _, b, _ in jobs]
+    ran = [0] * n
+    seq = count()
+    ready = {}  # job -> key
+
+    def queue(j):
+        ready[j] = _ready_key(tie_break, remaining[j], j, arrival, ran[j], next(seq))
+
+    def outranks(k, j):
+        return _outranks(tie_break, remaining[k], k, remaining[j], j, arrival)
+
+    log = []
+    completion = [0] * n
+    running = None
+    done = t = 0
+    while done < n:
+        arrivals = [k for k in range(n) if arrival[k] == t]
+        for k in arrivals:
+            queue(k)
+        if running is not None and not remaining[running]:
+            completion[running] = t
+            done += 1
+            running = None
+        if running is not None and any(outranks(k, running) for k in arrivals):
+            queue(running)
+            running = None
+        if running is None and ready:
+            running = min(ready, key=ready.get)
+            del ready[running]
+            ran[running] = 1
+        if running is not None:
+            log.append([running, t, t + 1])
+            remaining[running] -= 1
+        t += 1
+    return log, completion
+
+
+def _mlfq_ticks(jobs, quantum, tie_break):
+    # Each tick the arrivals join level 0, then the running job finishes,
+    # drops a level when its quantum is used up, or is preempted by an
+    # arrival when it runs below level 0 (back to the front of its level,
+    # with the rest of its quantum). A job that has to be picked checks for
+    # a boost first, which moves every level up to level 0; a job boosted
+    # while it waited starts over with the level 0 quantum. A boost is not
+    # noticed by the running job, only an arrival after it has been
+    # dispatched in an earlier boost period cannot preempt it.
+    settings = _mlfq_params(quantum)
+    quanta, boost = settings["quanta"], settings["boost_interval"]
+    n = len(jobs)
+    arrival = [a for a, _, _ in jobs]
+    remaining = [b for _, b, _ in jobs]
+    levels = [deque() for _ in quanta]
+    level = [0] * n
+    budget = [0] * n
+    queued = [0] * n  # Boost period the job was queued in
+    epoch = dispatched_epoch = 0
+
+    def queue(j, l, front=False):
+        if front:
+            levels[l].appendleft(j)
+        else:
+            levels[l].append(j)
+        queued[j] = epoch
+
+    log = []
+    completion = [0] * n
+    running = None
+    done = t = 0
+    while done < n:
+        arrivals = [k for k in range(n) if arrival[k] == t]
+        for k in arrivals:
+            level[k] = 0
+            budget[k] = quanta[0]
+            queue(k, 0)
+        if running is not None:
+            if not remaining[running]:
+                completion[running] = t
+                done += 1
+                running = None
+            elif not budget[running]:
+                l = min(level[running] + 1, len(quanta) - 1)
+                level[running] = l
+                budget[running] = quanta[l]
+                queue(running, l)
+                running = None
+            elif arrivals and level[running] and t // boost <= dispatched_epoch:
+                queue(running, level[running], front=True)
+                running = None
+        if running is None:
+            if t // boost > epoch:
+                epoch = t // boost
+                for l in range(1, len(levels)):
+                    levels[0].extend(levels[l])
+                    levels[l].clear()
+            top = next((l for l in levels if l), None)
+            if top is not None:
+                running = top.popleft()
+                if queued[running] < epoch:
+                    level[running] = 0
+                    budget[running] = quanta[0]
+                dispatched_epoch = epoch
+        if running is not None:
+            log.append([running, t, t + 1])
+            remaining[running] -= 1
+            budget[running] -= 1
+        t += 1
+    return log, completion
+
+
+def _priority_ticks(preemptive, params=None):
+    # The original tick by tick priority_scheduling, with aging when params
+    # (_aging_params) is given. Each tick the effective priority of every
+    # waiting job is worked out again from how long it has waited,
+    # priority - rate * (t - queued), and the best one runs once the CPU is
+    # free. A running job keeps the effective priority it was dispatched
+    # with; in PP an arrival that beats it takes over and the job is queued
+    # afresh, after that tick's arrivals.
+    def run(jobs, quantum, tie_break):
+        rate = params(quantum)["aging_rate"] if params else 0
+        n = len(jobs)
+        arrival = [a for a, _, _ in jobs]
+        remaining = [b for _, b, _ in jobs]
+        priority = [p for _, _, p in jobs]
+        ran = [0] * n
+        seq = count()
+        queued = {}  # job -> (time it was queued, queue order)
+
+        def key(j, t):
+            effective = priority[j] - rate * (t - queued[j][0])
+            return _ready_key(tie_break, effective, j, arrival, ran[j], queued[j][1])
+
+        def outranks(k, j, dispatched):
+            return _outranks(tie_break, priority[k], k, dispatched, j, arrival)
+
+        log = []
+        completion = [0] * n
+        running = dispatched = None
+        done = t = 0
+        while done < n:
+            arrivals = [k for k in range(n) if arrival[k] == t]
+            for k in arrivals:
+                queued[k] = (t, next(seq))
+            if running is not None and not remaining[running]:
+                completion[running] = t
+                done += 1
+                running = None
+            if (running is not None and preemptive
+                    and any(outranks(k, running, dispatched) for k in arrivals)):
+                queued[running] = (t, next(seq))
+                running = None
+            if running is None and queued:
+                running = min(queued, key=lambda j: key(j, t))
+                dispatched = key(running, t)[0]
+                del queued[running]
+                ran[running] = 1
+            if running is not None:
+                log.append([running, t, t + 1])
+                remaining[running] -= 1
+            t += 1
+        return log, completion
+    return run
+
+
+_scripts = {}
+
+
+def _script(filename):
+    if filename not in _scripts:
+        _scripts[filename] = load_script(filename)
+    return _scripts[filename]
+
+
+# group -> implementation name -> adapter, a group is named after its
+# algorithm. The first adapter of each is the one the others are compared
+# with.
+IMPLEMENTATIONS = {
+    "SJN": {
+        "engine": _engine("SJN"),
+        "compiled_processes.sjn_scheduling": _compiled(compiled_processes, "sjn_scheduling"),
+        "sjn_list": _nonpreemptive_list(1),
+    },
+    "RR": {
+        "engine": _engine("RR"),
+        "compiled_processes.round_robin_scheduling": _compiled(compiled_processes, "round_robin_scheduling"),
+        "rr_list": _rr_list,
+    },
+    "NP": {
+        "engine": _engine("NP"),
+        "compiled_processes.priority_scheduling": _compiled(compiled_processes, "priority_scheduling", False),
+        "priority_list": _nonpreemptive_list(2),
+    },
+    "PP": {
+        "engine": _engine("PP"),
+        "compiled_processes.priority_scheduling": _compiled(compiled_processes, "priority_scheduling", True),
+        "priority_ticks": _priority_ticks(True),
+    },
+    "NP aging": {
+        "engine": _engine("NP", _aging_params),
+        "compiled_processes.priority_scheduling": _compiled(compiled_processes, "priority_scheduling",
+                                                            False, params=_aging_params),
+        "priority_ticks": _priority_ticks(False, _aging_params),
+    },
+    "PP aging": {
+        "engine": _engine("PP", _aging_params),
+        "compiled_processes.priority_scheduling": _compiled(compiled_processes, "priority_scheduling",
+                                                            True, params=_aging_params),
+        "priority_ticks": _priority_ticks(True, _aging_params),
+    },
+    "SRTF": {
+        "engine": _engine("SRTF"),
+        "compiled_processes.srtf_scheduling": _compiled(compiled_processes, "srtf_scheduling"),
+        "srtf_ticks": _srtf_ticks,
+    },
+    "MLFQ": {
+        "engine": _engine("MLFQ", _mlfq_params),
+        "compiled_processes.mlfq_scheduling": _compiled(compiled_processes, "mlfq_scheduling",
+                                                        params=_mlfq_params),
+        "mlfq_ticks": _mlfq_ticks,
+    },
+    "SJN script": {
+        "engine": _engine("SJN", fixed_tie_break="arrival"),
+        "SJN.non_preemptive_sjn": _sjn_script,
+    },
+    "RR script": {
+        "engine": _engine("RR", fixed_tie_break="hungry"),
+        "RoundRobin.roundRobin": _rr_script,
+    },
+    "NP script": {
+        "engine": _engine("NP", fixed_tie_break="arrival"),
+        "non_preemptive_priority_scheduling": _priority_script(
+            "non_preemptive_priority.py", "non_preemptive_priority_scheduling"),
+    },
+    "PP script": {
+        "engine": _engine("PP", fixed_tie_break="arrival"),
+        "preemptive_priority_scheduling": _priority_script(
+            "preemptive priority.py", "preemptive_priority_scheduling"),
+    },
+}
+
+
+def normalize(log):
+    # Integer pids, and back to back runs of the same job merged, so per tick
+    # and per run logs compare equal
+    merged = []
+    for pid, start, end in log:
+        pid = int(str(pid).lstrip("P"))
+        if merged and merged[-1][0] == pid and merged[-1][2] == start:
+            merged[-1][2] = end
+        else:
+            merged.append([pid, start, end])
+    return merged
+
+
+def run_all(algorithm, jobs, quantum, names=None, tie_break="index"):
+    # name -> (normalized log or None, completion times)
+    outcomes = {}
+    for name, run in IMPLEMENTATIONS[algorithm].items():
+        if names is not None and name not in names:
+            continue
+        try:
+            log, completion = run(list(jobs), quantum, tie_break)
+            outcomes[name] = (None if log is None else normalize(log), completion)
+        except Exception as e:
+            outcomes[name] = (f"{type(e).__name__}: {e}", None)
+    return outcomes
+
+
+def first_difference(outcomes):
+    # (reference name, other name) of the first implementation that
+    # disagrees with the reference, or None. Completion times always count,
+    # logs only where both implementations return one.
+    names = list(outcomes)
+    reference = outcomes[names[0]]
+    for name in names[1:]:
+        log, completion = outcomes[name]
+        if completion != reference[1]:
+            return names[0], name
+        if log is not None and reference[0] is not None and log != reference[0]:
+            return names[0], name
+    return None
+
+
+def random_jobs(rng, max_jobs=8, max_arrival=10, max_burst=6, max_priority=3, ties=True):
+    # Small random workload. Without ties arrivals, bursts and priorities are
+    # all distinct, which is where every implementation should agree.
+    n = rng.randint(1, max_jobs)
+    if ties:
+        return [(rng.randint(0, max_arrival), rng.randint(1, max_burst), rng.randint(1, max_priority))
+                for _ in range(n)]
+    arrivals = rng.sample(range(max(max_arrival, n) + 1), n)
+    bursts = rng.sample(range(1, max(max_burst, n) + 1), n)
+    priorities = rng.sample(range(1, max(max_priority, n) + 1), n)
+    return list(zip(arrivals, bursts, priorities))
+
+
+def _smaller(jobs, quantum):
+    # Candidate simplifications of a failing case, biggest steps first
+    for i in range(len(jobs)):
+        if len(jobs) > 1:
+            yield jobs[:i] + jobs[i + 1:], quantum
+    # Whole workload steps, which keep the order of arrivals and bursts
+    first = min(a for a, _, _ in jobs)
+    if first:
+        yield [(a - first, b, p) for a, b, p in jobs], quantum
+    if any(b > 1 for _, b, _ in jobs):
+        yield [(a, (b + 1) // 2, p) for a, b, p in jobs], quantum
+    for i, (a, b, p) in enumerate(jobs):
+        for job in ((0, b, p), (a // 2, b, p), (a - 1, b, p), (a, 1, p), (a, b // 2 or 1, p),
+                    (a, b - 1, p), (a, b, 1), (a, b, p - 1)):
+            if job != (a, b, p) and job[0] >= 0 and job[1] > 0 and job[2] > 0:
+                yield jobs[:i] + [job] + jobs[i + 1:], quantum
+    if quantum > 1:
+        yield jobs, quantum - 1
+
+
+def shrink(algorithm, jobs, quantum, names, tie_break="index"):
+    # Greedily apply any simplification that keeps the two implementations
+    # apart, until none does
+    changed = True
+    while changed:
+        changed = False
+        for smaller, q in _smaller(jobs, quantum):
+            if first_difference(run_all(algorithm, smaller, q, names, tie_break)):
+                jobs, quantum = smaller, q
+                changed = True
+                break
+    return jobs, quantum
+
+
+def check(algorithm, trials=1000, seed=1, ties=True, max_jobs=8, exclude=(), tie_break="index"):
+    # Run every implementation of algorithm on trials random workloads.
+    # Returns None when they all agree, otherwise the first failing workload
+    # shrunk to a minimal one as (jobs, quantum, names, outcomes).
+    rng = random.Random(seed)
+    names = [name for name in IMPLEMENTATIONS[algorithm] if name not in exclude]
+    for _ in range(trials):
+        jobs = random_jobs(rng, max_jobs, ties=ties)
+        quantum = rng.randint(1, 4)
+        pair = first_difference(run_all(algorithm, jobs, quantum, names, tie_break))
+        if pair:
+            jobs, quantum = shrink(algorithm, jobs, quantum, list(pair), tie_break)
+            return jobs, quantum, pair, run_all(algorithm, jobs, quantum, pair, tie_break)
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare every implementation of each algorithm")
+    parser.add_argument("--algorithms", default=",".join(IMPLEMENTATIONS))
+    parser.add_argument("--trials", type=int, default=1000, help="Random workloads per algorithm")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--jobs", type=int, default=8, help="Most jobs in a workload")
+    parser.add_argument("--no-ties", action="store_true",
+                        help="Distinct arrivals, bursts and priorities, so tie-breaking never matters")
+    parser.add_argument("--exclude", default="", help="Comma separated implementation names to skip")
+    parser.add_argument("--tie-break", choices=list(engine.TIE_BREAKS), default="index",
+                        help="Tie-break of the engine and the references (the script groups "
+                             "keep their own)")
+
+    args = parser.parse_args(argv)
+    exclude = set(filter(None, args.exclude.split(",")))
+    failed = False
+    algorithms = args.algorithms.split(",")
+    if args.tie_break != "index" and "MLFQ" in algorithms:
+        algorithms.remove("MLFQ")  # FIFO levels only
+    for algorithm in algorithms:
+        if algorithm not in IMPLEMENTATIONS:
+            parser.error(f"unknown algorithm {algorithm!r}")
+        found = check(algorithm, args.trials, args.seed, not args.no_ties, args.jobs, exclude,
+                      args.tie_break)
+        if found is None:
+            print(f"{algorithm}: all implementations agree on {args.trials} workloads")
+            continue
+        failed = True
+        jobs, quantum, pair, outcomes = found
+        print(f"{algorithm}: {pair[0]} and {pair[1]} differ, minimal case:")
+        for i, (a, b, p) in enumerate(jobs):
+            print(f"    P{i}: arrival {a}, burst {b}, priority {p}")
+        if algorithm.startswith("RR"):
+            print(f"    time quantum {quantum}")
+        elif algorithm == "MLFQ":
+            print(f"    {_mlfq_params(quantum)}")
+        elif algorithm.endswith(" aging"):
+            print(f"    aging rate {_aging_params(quantum)['aging_rate']}")
+        for name in pair:
+            log, completion = outcomes[name]
+            print(f"  {name}:")
+            if log is not None:
+                print("    log        " + ", ".join(f"P{pid} {s}-{e}" for pid, s, e in log))
+            print(f"    completion {completion}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
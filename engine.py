@@ -0,0 +1,697 @@
+import heapq
+from array import array
+from collections import deque
+from fractions import Fraction
+from functools import partial
+from itertools import count, islice
+
+from workload import Result, Workload
+
+# Algorithms simulate() knows about, code -> display name
+ALGORITHMS = {
+    "SJN": "Shortest Job Next",
+    "RR": "Round Robin",
+    "NP": "Non-preemptive Priority",
+    "PP": "Preemptive Priority",
+    "SRTF": "Shortest Remaining Time First",
+    "MLFQ": "Multi-level Feedback Queue",
+}
+
+# Algorithms that ignore priority, the input forms and loaders do not ask
+# for one
+NO_PRIORITY_ALGORITHMS = ("SJN", "SRTF", "MLFQ")
+
+# MLFQ defaults: the quantum of each level, top level first, and the time
+# between priority boosts (None for no boost)
+MLFQ_QUANTA = (4, 8, 16)
+MLFQ_BOOST = 200
+
+
+def _arrival_order(arrival):
+    # Indices of the jobs in arrival order (stable). Loaders and generators
+    # already produce sorted arrivals, in which case no index list is built.
+    if all(a <= b for a, b in zip(arrival, islice(arrival, 1, None))):
+        return range(len(arrival))
+    return array("q", sorted(range(len(arrival)), key=arrival.__getitem__))
+
+
+def _zeros(n):
+    return array("q", bytes(8 * n))
+
+
+# Scheduling policies. The simulation core (iter_policy) owns the clock,
+# admits arrivals, builds the segments and fills in completion times; a
+# policy only keeps the ready jobs and decides which one runs next:
+#   admit(j)         job j has arrived
+#   select()         remove and return the next job to run
+#   time_slice(j)    longest run j gets before it is preempted, or None
+#                    for no limit (time_slice itself may be None too)
+#   preempt(j, k, left)
+#                    True if job k, arriving while j runs with left time
+#                    units still to go, takes the CPU from j; None for
+#                    non-preemptive policies
+#   requeue(j)       j stopped before finishing and is ready again
+#   len(policy)      number of ready jobs
+#   remaining        optional array("q") of burst times the core counts
+#                    down in place, for policies that rank by it
+#   advance(now)     optional, the clock is at now and a job is about to
+#                    be selected
+#   state()          picklable snapshot of the ready queue and whatever else
+#                    the policy changes during a run (not remaining, the
+#                    core saves that), for checkpoints
+#   restore(state)   load a state() snapshot into a freshly made policy
+
+
+# Tie-breaks among equally ranked ready jobs, name -> description.
+# "arrival" is the order of the standalone SJN and priority scripts.
+# "hungry" is the rule from the RoundRobin.py spec: among jobs with the same
+# priority and arrival time, one that has not run yet goes first.
+# Round Robin queues in arrival then index order anyway, so only hungry
+# changes it.
+TIE_BREAKS = {
+    "index": "Lower job index (list order) first",
+    "arrival": "Earlier arrival first, then lower job index",
+    "hungry": "Earlier arrival first, then jobs that have not run yet",
+}
+
+
+def _check_tie_break(tie_break):
+    if tie_break not in TIE_BREAKS:
+        raise ValueError(f"Unknown tie-break: {tie_break}")
+
+
+def _hungry_heap(arrival, n):
+    # Ready heap for the hungry tie-break. Entries are (key, arrival,
+    # has_run, seq, job) with seq counting pushes, so equal keys go by
+    # arrival, then never-run jobs first, then queue order, all in the one
+    # O(log n) heap operation. An arriving job outranks the running one on
+    # an equal key and arrival, it has not run yet.
+    ready = []
+    ran = bytearray(n)
+    seq = count()
+    heappush, heappop = heapq.heappush, heapq.heappop
+
+    def push(key, j):
+        heappush(ready, (key, arrival[j], ran[j], next(seq), j))
+
+    def pop():
+        entry = heappop(ready)
+        j = entry[4]
+        ran[j] = 1
+        return entry[0], j
+
+    def outranks(key_k, k, key_j, j):
+        return (key_k, arrival[k], 0) < (key_j, arrival[j], 1)
+
+    def state():
+        nonlocal seq
+        following = next(seq)
+        seq = count(following)
+        return ready, ran, following
+
+    def restore(state):
+        nonlocal seq
+        ready[:], ran[:], following = state
+        seq = count(following)
+
+    return ready, push, pop, outranks, state, restore
+
+
+def _index_heap(arrival, n):
+    # Ready heap of (key, job) entries, ties go to the lower index
+    ready = []
+    heappush = heapq.heappush
+
+    def restore(state):
+        ready[:] = state
+
+    return (ready, lambda key, j: heappush(ready, (key, j)), partial(heapq.heappop, ready),
+            lambda key_k, k, key_j, j: (key_k, k) < (key_j, j), lambda: ready, restore)
+
+
+def _arrival_heap(arrival, n):
+    # Ready heap of (key, arrival, job) entries, ties go to the earlier
+    # arrival, then the lower index
+    ready = []
+    heappush = heapq.heappush
+
+    def pop():
+        key, _, j = heapq.heappop(ready)
+        return key, j
+
+    def restore(state):
+        ready[:] = state
+
+    return (ready, lambda key, j: heappush(ready, (key, arrival[j], j)), pop,
+            lambda key_k, k, key_j, j: (key_k, arrival[k], k) < (key_j, arrival[j], j),
+            lambda: ready, restore)
+
+
+_HEAPS = {"index": _index_heap, "arrival": _arrival_heap, "hungry": _hungry_heap}
+
+
+def _ready_heap(tie_break, arrival, n):
+    # Ready queue of the heap based policies for n jobs, as
+    #   (heap, push(key, j), pop() -> (key, j), outranks(key_k, k, key_j, j),
+    #    state(), restore(state))
+    # where outranks tells whether arriving job k, ranked key_k, takes the CPU
+    # from running job j, ranked key_j. Smaller keys come first, ties are
+    # broken by tie_break (arrival is not needed for "index").
+    _check_tie_break(tie_break)
+    return _HEAPS[tie_break](arrival, n)
+
+
+class RankPolicy:
+    # Smallest rank first from a min-heap, ties go to the lower index, which
+    # matches the old "first in the list wins" behaviour, or are broken by
+    # another of the TIE_BREAKS. rank is burst for SJN and priority for NP
+    # and PP.
+    time_slice = None
+    preempt = None
+
+    def __init__(self, rank, preemptive=False, arrival=None, tie_break="index"):
+        (self.ready, push, pop, outranks,
+         self.heap_state, self.heap_restore) = _ready_heap(tie_break, arrival, len(rank))
+        # Closures rather than methods, the core calls these once per event
+        self.admit = self.requeue = lambda j: push(rank[j], j)
+        self.select = lambda: pop()[1]
+        if preemptive:
+            # Only an arrival that outranks the running job changes the
+            # heap top, any other one just waits in the heap
+            self.preempt = lambda j, k, left: outranks(rank[k], k, rank[j], j)
+
+    def __len__(self):
+        return len(self.ready)
+
+    def state(self):
+        return self.heap_state()
+
+    def restore(self, state):
+        self.heap_restore(state)
+
+
+class AgingPolicy:
+    # Priority order (NP, PP) where a waiting job gains rate priority levels
+    # per time unit, counted from when it was last queued. The effective
+    # priority at time t is priority - rate * (t - queued), and since
+    # rate * t is the same for every waiting job, the heap can stay keyed on
+    # priority + rate * queued: no job is touched as time passes. rate is
+    # kept as a fraction N/D so the keys are the exact integers
+    # priority * D + N * queued. A running job keeps the effective priority
+    # it was dispatched with; a preempted one is queued afresh.
+    time_slice = None
+    preempt = None
+
+    def __init__(self, arrival, burst, priority, rate, preemptive=False, tie_break="index"):
+        rate = Fraction(rate).limit_denominator(1_000_000)
+        if rate < 0:
+            raise ValueError("Aging rate must not be negative")
+        self.scale, self.step = rate.denominator, rate.numerator
+        self.arrival = arrival
+        self.priority = priority
+        self.remaining = array("q", burst)
+        (self.ready, self.push, self.pop, self.outranks,
+         self.heap_state, self.heap_restore) = _ready_heap(tie_break, arrival, len(burst))
+        self.now = 0
+        self.dispatched = 0  # Key of the selected job, as of its dispatch
+        self.dispatched_left = 0
+        if preemptive:
+            self.preempt = self._preempt
+
+    def __len__(self):
+        return len(self.ready)
+
+    def admit(self, j):
+        self.push(self.priority[j] * self.scale + self.step * self.arrival[j], j)
+
+    def advance(self, now):
+        self.now = now
+
+    def select(self):
+        key, j = self.pop()
+        self.dispatched = key - self.step * self.now
+        self.dispatched_left = self.remaining[j]
+        return j
+
+    def _preempt(self, j, k, left):
+        # k has not waited yet, so its effective priority is its own
+        return self.outranks(self.priority[k] * self.scale, k, self.dispatched, j)
+
+    def requeue(self, j):
+        stopped = self.now + self.dispatched_left - self.remaining[j]
+        self.push(self.priority[j] * self.scale + self.step * stopped, j)
+
+    def state(self):
+        return self.heap_state(), self.now, self.dispatched, self.dispatched_left
+
+    def restore(self, state):
+        heap, self.now, self.dispatched, self.dispatched_left = state
+        self.heap_restore(heap)
+
+
+class RemainingTimePolicy:
+    # Shortest remaining time first from a min-heap keyed on remaining time.
+    # The core counts down this policy's remaining array, so a preempted job
+    # goes back under the time it has left, and an arrival only preempts
+    # when it needs less than the running job has left at that moment.
+    time_slice = None
+
+    def __init__(self, burst, arrival=None, tie_break="index"):
+        self.remaining = remaining = array("q", burst)
+        (self.ready, push, pop, outranks,
+         self.heap_state, self.heap_restore) = _ready_heap(tie_break, arrival, len(burst))
+        self.admit = self.requeue = lambda j: push(remaining[j], j)
+        self.select = lambda: pop()[1]
+        self.preempt = lambda j, k, left: outranks(remaining[k], k, left, j)
+
+    def __len__(self):
+        return len(self.ready)
+
+    def state(self):
+        return self.heap_state()
+
+    def restore(self, state):
+        self.heap_restore(state)
+
+
+class FeedbackPolicy:
+    # Multi-level feedback queue, dispatched like Round Robin with one FIFO
+    # per level. New jobs start at level 0, a job that uses up the quantum
+    # of its level moves one level down, and an arrival preempts a job
+    # running below level 0 (the preempted job keeps what is left of its
+    # quantum and goes back to the front of its level). Every boost_interval
+    # time units all jobs go back to level 0.
+    #
+    # The levels are deques of FIFO segments and bits has bit l set while
+    # level l holds jobs, so select() finds the top level in O(1). A boost
+    # only moves the lower levels' segments behind level 0's and bumps the
+    # epoch; each job notices it was boosted (its level and quantum reset)
+    # the next time it is selected.
+    def __init__(self, arrival, burst, quanta=MLFQ_QUANTA, boost_interval=MLFQ_BOOST):
+        if not quanta or any(q <= 0 for q in quanta):
+            raise ValueError("Time quanta must be positive")
+        if boost_interval is not None and boost_interval <= 0:
+            raise ValueError("Boost interval must be positive")
+        n = len(burst)
+        self.arrival = arrival
+        self.quanta = tuple(quanta)
+        self.boost_interval = boost_interval
+        self.remaining = array("q", burst)
+        self.level = array("q", bytes(8 * n))
+        self.budget = array("q", bytes(8 * n))  # Quantum left at its level
+        self.queued = array("q", bytes(8 * n))  # Epoch the job was queued in
+        self.levels = [deque() for _ in quanta]
+        self.counts = [0] * len(quanta)
+        self.size = 0
+        self.bits = 0
+        self.epoch = 0
+        self.dispatched = 0  # Remaining time of the selected job at dispatch
+        self.time_slice = self.budget.__getitem__
+
+    def __len__(self):
+        return self.size
+
+    def _push(self, j, level, front=False):
+        segments = self.levels[level]
+        if not segments:
+            segments.append(deque())
+        if front:
+            segments[0].appendleft(j)
+        else:
+            segments[-1].append(j)
+        self.size += 1
+        self.counts[level] += 1
+        self.bits |= 1 << level
+        self.queued[j] = self.epoch
+
+    def admit(self, j):
+        # _push(j, 0) inlined, this runs once per job
+        self.level[j] = 0
+        self.budget[j] = self.quanta[0]
+        self.queued[j] = self.epoch
+        segments = self.levels[0]
+        if segments:
+            segments[-1].append(j)
+        else:
+            segments.append(deque((j,)))
+        self.size += 1
+        self.counts[0] += 1
+        self.bits |= 1
+
+    def select(self):
+        bits = self.bits
+        level = (bits & -bits).bit_length() - 1
+        segments = self.levels[level]
+        segment = segments[0]
+        j = segment.popleft()
+        if not segment:
+            segments.popleft()
+        self.size -= 1
+        self.counts[level] -= 1
+        if not self.counts[level]:
+            self.bits = bits & ~(1 << level)
+        if self.queued[j] < self.epoch:
+            # Boosted while it waited
+            self.level[j] = 0
+            self.budget[j] = self.quanta[0]
+        self.dispatched = self.remaining[j]
+        return j
+
+    def preempt(self, j, k, left):
+        if not self.level[j]:
+            return False
+        # A boost before k arrives takes j back to level 0 as well
+        return self.boost_interval is None or self.arrival[k] // self.boost_interval <= self.epoch
+
+    def requeue(self, j):
+        self.budget[j] -= self.dispatched - self.remaining[j]
+        level = self.level[j]
+        if self.budget[j]:
+            # Preempted, the rest of its quantum comes first once its
+            # level is the top one again
+            self._push(j, level, front=True)
+            return
+        level = min(level + 1, len(self.quanta) - 1)
+        self.level[j] = level
+        self.budget[j] = self.quanta[level]
+        self._push(j, level)
+
+    def advance(self, now):
+        if self.boost_interval is None:
+            return
+        epoch = now // self.boost_interval
+        if epoch > self.epoch:
+            self.epoch = epoch
+            top = self.levels[0]
+            for level in range(1, len(self.levels)):
+                top.extend(self.levels[level])
+                self.levels[level].clear()
+                self.counts[0] += self.counts[level]
+                self.counts[level] = 0
+            self.bits = 1 if self.counts[0] else 0
+
+    def state(self):
+        return (self.level, self.budget, self.queued, self.levels, self.counts,
+                self.size, self.bits, self.epoch, self.dispatched)
+
+    def restore(self, state):
+        # In place, time_slice is bound to budget
+        (self.level[:], self.budget[:], self.queued[:], self.levels[:], self.counts[:],
+         self.size, self.bits, self.epoch, self.dispatched) = state
+
+
+class RoundRobinPolicy:
+    # FIFO deque, each dispatch runs for at most one time quantum
+    preempt = None
+
+    def __init__(self, time_quantum):
+        if time_quantum <= 0:
+            raise ValueError("Time quantum must be positive")
+        self.time_quantum = time_quantum
+        self.ready = deque()
+        self.admit = self.requeue = self.ready.append
+        self.select = self.ready.popleft
+
+    def __len__(self):
+        return len(self.ready)
+
+    def time_slice(self, j):
+        return self.time_quantum
+
+    def state(self):
+        return self.ready
+
+    def restore(self, state):
+        # In place, admit and select are bound to the deque
+        self.ready.clear()
+        self.ready.extend(state)
+
+
+class HungryRoundRobinPolicy:
+    # Round Robin with the hungry tie-break. Jobs still go in the order they
+    # were queued; among jobs queued at the same moment, the ones that have
+    # not run yet (the arrivals) go ahead of the one whose quantum just
+    # ended, as in plain Round Robin, then lower priority, then earlier
+    # arrival. The queue is a heap keyed on
+    # (queued at, has_run, priority, arrival, seq).
+    preempt = None
+
+    def __init__(self, arrival, burst, priority, time_quantum):
+        if time_quantum <= 0:
+            raise ValueError("Time quantum must be positive")
+        self.time_quantum = time_quantum
+        self.arrival = arrival
+        self.priority = priority
+        self.remaining = array("q", burst)
+        self.ready = []
+        self.seq = count()
+        self.now = 0
+        self.dispatched_left = 0
+
+    def __len__(self):
+        return len(self.ready)
+
+    def admit(self, j):
+        arrival = self.arrival[j]
+        heapq.heappush(self.ready, (arrival, 0, self.priority[j], arrival, next(self.seq), j))
+
+    def advance(self, now):
+        self.now = now
+
+    def select(self):
+        j = heapq.heappop(self.ready)[5]
+        self.dispatched_left = self.remaining[j]
+        return j
+
+    def requeue(self, j):
+        stopped = self.now + self.dispatched_left - self.remaining[j]
+        heapq.heappush(self.ready, (stopped, 1, self.priority[j], self.arrival[j], next(self.seq), j))
+
+    def time_slice(self, j):
+        return self.time_quantum
+
+    def state(self):
+        following = next(self.seq)
+        self.seq = count(following)
+        return self.ready, following, self.now, self.dispatched_left
+
+    def restore(self, state):
+        self.ready, following, self.now, self.dispatched_left = state
+        self.seq = count(following)
+
+
+# iter_policy is a generator that yields (job, start, end) segments as soon
+# as they are decided, so a run never has to hold its whole log. It writes
+# completion[job] before yielding the job's last segment, which lets a
+# consumer spot completions as completion[job] == end. stream() runs it on a
+# Workload, simulate() collects a whole run into a Result and schedule()
+# runs a list of Process objects.
+
+
+def iter_policy(arrival, burst, policy, completion, checkpoint=None, resume=None, probe=None):
+    # The one simulation loop behind every algorithm. Jobs are identified by
+    # their index into the arrival/burst columns. Time only advances to the
+    # next event: a completion, the end of a time slice, or an arrival that
+    # preempts the running job. A job that is selected again right after it
+    # stopped stays in one segment, the end of a time slice always closes one.
+    #
+    # checkpoint (a checkpoint.Checkpointer) is handed the whole loop state
+    # between events whenever it is due; resume is such a state, the run then
+    # carries on from it exactly as the saved one would have. Every segment
+    # yielded before a save has been consumed by then.
+    #
+    # probe (a probe.Probe) counts the policy calls, loop iterations and idle
+    # jumps; the policy calls go through its counting wrappers only when
+    # there is one.
+    n = len(arrival)
+    order = _arrival_order(arrival)  # Arrival-sorted cursor
+    cursor = 0
+    remaining = getattr(policy, "remaining", None)
+    if remaining is None:
+        remaining = array("q", burst)
+    current_time = 0
+    running = None  # Job of the segment currently being built
+    run_start = 0
+    admit, select, requeue = policy.admit, policy.select, policy.requeue
+    time_slice, preempt = policy.time_slice, policy.preempt
+    advance = getattr(policy, "advance", None)
+    if probe is not None:
+        admit, select, requeue, preempt = probe.counted(admit, select, requeue, preempt)
+    if resume is not None:
+        cursor, current_time = resume["cursor"], resume["time"]
+        running, run_start = resume["running"], resume["run_start"]
+        remaining[:] = resume["remaining"]
+        completion[:] = resume["completion"]
+        policy.restore(resume["policy"])
+    if checkpoint is not None:
+        check_at = checkpoint.start(current_time)
+        steps = checkpoint.steps
+
+    while cursor < n or policy:
+        if probe is not None:
+            probe.ticks += 1
+        if checkpoint is not None:
+            # Simulated time is checked every event, the wall clock every
+            # checkpoint.steps events
+            steps -= 1
+            if current_time >= check_at or not steps:
+                if checkpoint.due(current_time):
+                    checkpoint.save({"cursor": cursor, "time": current_time, "running": running,
+                                     "run_start": run_start, "remaining": remaining,
+                                     "completion": completion, "policy": policy.state()})
+                check_at, steps = checkpoint.check_at, checkpoint.steps
+
+        # Admit every job that has arrived by now
+        while cursor < n:
+            j = order[cursor]
+            if arrival[j] > current_time:
+                break
+            admit(j)
+            cursor += 1
+
+        if not policy:
+            # CPU is idle, jump straight to the next arrival
+            if probe is not None:
+                probe.idle_jumps += 1
+            current_time = arrival[order[cursor]]
+            continue
+
+        if advance is not None:
+            advance(current_time)
+        j = select()
+        if j != running:
+            # Close the segment of the job we switched away from
+            if running is not None:
+                yield (running, run_start, current_time)
+            running = j
+            run_start = current_time
+
+        left = remaining[j]
+        end_time = current_time + left
+        expires = False
+        if time_slice is not None:
+            limit = time_slice(j)
+            if limit is not None and limit < left:
+                end_time = current_time + limit
+                expires = True
+        if preempt is not None:
+            # Arrivals before end_time queue up behind j unless one of them
+            # preempts it, then j stops at that arrival
+            while cursor < n:
+                k = order[cursor]
+                if arrival[k] >= end_time:
+                    break
+                admit(k)
+                cursor += 1
+                if preempt(j, k, left - (arrival[k] - current_time)):
+                    end_time = arrival[k]
+                    expires = False
+                    break
+        left -= end_time - current_time
+        current_time = end_time
+
+        if not left:
+            completion[j] = current_time
+            yield (j, run_start, current_time)
+            running = None
+            continue
+        remaining[j] = left
+        if expires:
+            yield (j, run_start, current_time)
+            running = None
+        # Arrivals up to now go ahead of the job that was just stopped
+        while cursor < n:
+            k = order[cursor]
+            if arrival[k] > current_time:
+                break
+            admit(k)
+            cursor += 1
+        requeue(j)
+
+
+def record_results(processes, completion):
+    # Write completion, turnaround and waiting time back into Process objects
+    for process, completion_time in zip(processes, completion):
+        process.completion_time = completion_time
+        process.turnaround_time = completion_time - process.arrival_time
+        process.waiting_time = process.turnaround_time - process.burst_time
+
+
+def schedule(processes, algorithm, probe=None, **params):
+    # Run a list of Process objects through any of the ALGORITHMS, with the
+    # same params as simulate(), and write the results back into them. The
+    # list itself is left in the order the caller gave it. A probe.Probe, if
+    # given, counts the run and fires its events.
+    workload = Workload.from_processes(processes)
+    completion = _zeros(len(workload))
+    segments = _segments(workload, algorithm, completion, params, probe=probe)
+    if probe is not None:
+        segments = probe.watch(segments, completion)
+    execution_log = [[processes[j].pid, start, end] for j, start, end in segments]
+    record_results(processes, completion)
+    for process in processes:
+        process.remaining_time = 0
+    return execution_log
+
+
+def make_policy(workload, algorithm, params):
+    # Policy object for one of the ALGORITHMS codes. Every algorithm but
+    # MLFQ (whose levels are its only priority) takes a tie_break param, see
+    # TIE_BREAKS.
+    tie_break = params.get("tie_break", "index")
+    _check_tie_break(tie_break)
+    arrival = workload.arrival
+    if algorithm == "SJN":
+        return RankPolicy(workload.burst, False, arrival, tie_break)
+    if algorithm == "RR":
+        if tie_break == "hungry":
+            return HungryRoundRobinPolicy(arrival, workload.burst, workload.priority,
+                                          params["time_quantum"])
+        return RoundRobinPolicy(params["time_quantum"])
+    if algorithm in ("NP", "PP"):
+        preemptive = algorithm == "PP"
+        if params.get("aging_rate"):
+            return AgingPolicy(arrival, workload.burst, workload.priority,
+                               params["aging_rate"], preemptive, tie_break)
+        return RankPolicy(workload.priority, preemptive, arrival, tie_break)
+    if algorithm == "SRTF":
+        return RemainingTimePolicy(workload.burst, arrival, tie_break)
+    if algorithm == "MLFQ":
+        if tie_break != "index":
+            raise ValueError("MLFQ has no tie-break, its levels are FIFO")
+        return FeedbackPolicy(arrival, workload.burst, params.get("quanta", MLFQ_QUANTA),
+                              params.get("boost_interval", MLFQ_BOOST))
+    raise ValueError(f"Unknown algorithm: {algorithm}")
+
+
+def _segments(workload, algorithm, completion, params, checkpoint=None, resume=None, probe=None):
+    policy = make_policy(workload, algorithm, params)
+    return iter_policy(workload.arrival, workload.burst, policy, completion, checkpoint, resume,
+                       probe)
+
+
+def stream(spec, algorithm, completion=None, probe=None, checkpoint=None, resume=None, **params):
+    # Streaming form of simulate(): an iterator of (row index, start, end)
+    # segments. Pass a zeroed array("q") as completion to get completion
+    # times filled in while the stream is consumed. checkpoint and resume
+    # are passed on to iter_policy; a resumed stream starts with the first
+    # segment the saved run had not yielded yet.
+    workload = spec if isinstance(spec, Workload) else Workload.from_processes(spec)
+    if completion is None:
+        completion = _zeros(len(workload))
+    segments = _segments(workload, algorithm, completion, params, checkpoint, resume, probe)
+    if probe is not None:
+        segments = probe.watch(segments, completion)
+    return segments
+
+
+def simulate(spec, algorithm, probe=None, **params):
+    # Schedule a workload with one of the GUI/CLI algorithm codes (SJN, RR,
+    # NP, PP, SRTF, MLFQ) and return a Result. The spec is never modified, so
+    # the same Workload can be passed to any number of simulate() calls,
+    # including concurrent ones. Lists of JobSpec or Process objects are accepted too.
+    # A probe.Probe, if given, counts the run and fires its events.
+    workload = spec if isinstance(spec, Workload) else Workload.from_processes(spec)
+    completion = _zeros(len(workload))
+    log = list(stream(workload, algorithm, completion, probe, **params))
+    return Result(workload, algorithm, params, completion, log)
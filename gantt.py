@@ -0,0 +1,183 @@
+from bisect import bisect_right
+from operator import itemgetter
+
+# Level of detail: runs narrower than MIN_BAR pixels are merged into one
+# aggregate bar, bars narrower than MIN_LABEL get no pid label, and time
+# labels are at least MIN_TICK_GAP pixels apart. Together they bound the
+# number of canvas items by the canvas width, whatever the log length.
+MIN_BAR = 3
+MIN_LABEL = 30
+MIN_TICK_GAP = 40
+
+MAX_SCALE = 50  # Pixels per time unit when zoomed all the way in
+MARGIN = 20     # Pixels left free at both ends of the timeline
+
+BAR_COLOR = "lightblue"
+MERGED_COLOR = "#7FA7C9"
+
+_end = itemgetter(2)
+
+
+def layout(execution_log, t0, scale, width):
+    # Bars for the part of a time ordered [pid, start, end] log that is
+    # visible from time t0 over width pixels, at scale pixels per time unit.
+    # Returns (x1, x2, pid) tuples with pid None for merged runs. Only the
+    # visible segments are looked at, and a run of narrow segments is
+    # skipped with one bisect, so the cost depends on the width rather than
+    # on how many segments are in view.
+    t1 = t0 + width / scale
+    i = bisect_right(execution_log, t0, key=_end)  # First segment ending after t0
+    n = len(execution_log)
+    bars = []
+    while i < n:
+        pid, start, end = execution_log[i]
+        if start >= t1:
+            break
+        x1 = (start - t0) * scale
+        x2 = (end - t0) * scale
+        if x2 - x1 >= MIN_BAR:
+            bars.append((x1, x2, pid))
+            i += 1
+            continue
+        # Everything that ends within MIN_BAR pixels of this start goes into
+        # one bar
+        j = bisect_right(execution_log, start + MIN_BAR / scale, i, n, key=_end)
+        if j - i == 1:
+            bars.append((x1, x2, pid))
+        else:
+            bars.append((x1, (execution_log[j - 1][2] - t0) * scale, None))
+        i = j
+    return bars
+
+
+class GanttView:
+    # Zoomable, scrollable Gantt chart on a Tk canvas. Only what is on screen
+    # is drawn, and it is redrawn on resize, scroll and zoom. Scrolling is
+    # done here rather than with a canvas scrollregion, so the time axis can
+    # be any length.
+    def __init__(self, canvas, scrollbar=None):
+        self.canvas = canvas
+        self.scrollbar = scrollbar
+        self.execution_log = []
+        self.total_time = 0
+        self.t0 = 0
+        self.scale = MAX_SCALE
+        self.fitted = True  # Follow the canvas width until the user zooms
+        self.pending = None
+
+        if scrollbar is not None:
+            scrollbar.configure(command=self.xview)
+        canvas.bind("<Configure>", lambda event: self.schedule_redraw())
+        canvas.bind("<MouseWheel>", self.on_wheel)  # Windows and macOS
+        canvas.bind("<Shift-MouseWheel>", self.on_wheel)
+        canvas.bind("<Button-4>", self.on_wheel)  # X11
+        canvas.bind("<Button-5>", self.on_wheel)
+        canvas.bind("<Shift-Button-4>", self.on_wheel)
+        canvas.bind("<Shift-Button-5>", self.on_wheel)
+
+    def show(self, execution_log):
+        self.execution_log = execution_log
+        self.total_time = execution_log[-1][2] if execution_log else 0
+        self.t0 = 0
+        self.fitted = True
+        self.schedule_redraw()
+
+    def chart_width(self):
+        return max(1, self.canvas.winfo_width() - 2 * MARGIN)
+
+    def fit_scale(self):
+        # The old chart size: at most MAX_SCALE per time unit, shrunk so the
+        # whole run fits
+        return min(MAX_SCALE, self.chart_width() / self.total_time) if self.total_time else MAX_SCALE
+
+    def visible_time(self):
+        return self.chart_width() / self.scale
+
+    def clamp(self):
+        self.t0 = max(0, min(self.t0, self.total_time - self.visible_time()))
+
+    def schedule_redraw(self):
+        # Scroll and wheel events come in bursts, draw once they settle
+        if self.pending is None:
+            self.pending = self.canvas.after_idle(self.redraw)
+
+    def zoom(self, factor, x=None):
+        # Zoom around canvas position x (the middle by default), never out
+        # past the whole run
+        if not self.total_time:
+            return
+        width = self.chart_width()
+        x = width / 2 if x is None else min(max(x - MARGIN, 0), width)
+        anchor = self.t0 + x / self.scale
+        fit = self.fit_scale()
+        self.scale = min(max(self.scale * factor, fit), MAX_SCALE)
+        self.fitted = self.scale == fit
+        self.t0 = anchor - x / self.scale
+        self.clamp()
+        self.schedule_redraw()
+
+    def xview(self, *args):
+        # Scrollbar command: ("moveto", fraction) or ("scroll", n, "units"|"pages")
+        if not self.total_time:
+            return
+        if args[0] == "moveto":
+            self.t0 = float(args[1]) * self.total_time
+        elif args[0] == "scroll":
+            step = self.visible_time() * (0.9 if args[2] == "pages" else 0.1)
+            self.t0 += int(args[1]) * step
+        self.clamp()
+        self.schedule_redraw()
+
+    def on_wheel(self, event):
+        up = event.num == 4 or getattr(event, "delta", 0) > 0
+        if event.state & 0x0001:  # Shift scrolls
+            self.xview("scroll", -1 if up else 1, "units")
+        else:
+            self.zoom(1.25 if up else 0.8, event.x)
+
+    def redraw(self):
+        self.pending = None
+        canvas = self.canvas
+        canvas.delete("all")
+        if self.scrollbar is not None:
+            self.scrollbar.set(0, 1)
+        if not self.execution_log:
+            return
+
+        if self.fitted:
+            self.scale = self.fit_scale()
+        self.clamp()
+        width = self.chart_width()
+        span = self.total_time * self.scale
+
+        # Center the chart when it is narrower than the canvas
+        left = MARGIN + max(0, (width - span) / 2)
+        right = left + min(width, span)
+        y_pos = canvas.winfo_height() - 30
+        y_top = y_pos - 40
+
+        canvas.create_line(left, y_pos, right, y_pos, fill="black")
+        last_tick = None
+        for start, end, pid in layout(self.execution_log, self.t0, self.scale, width):
+            # Bars running off either edge are cut at the edge
+            x1 = left + max(start, 0)
+            x2 = min(left + end, right)
+            if pid is None:
+                canvas.create_rectangle(x1, y_top, x2, y_pos, fill=MERGED_COLOR, outline="")
+                continue
+            canvas.create_rectangle(x1, y_top, x2, y_pos, fill=BAR_COLOR, outline="black")
+            if x2 - x1 >= MIN_LABEL:
+                canvas.create_text((x1 + x2) / 2, (y_top + y_pos) / 2, text=pid)
+            if start >= 0 and (last_tick is None or x1 - last_tick >= MIN_TICK_GAP):
+                canvas.create_line(x1, y_pos, x1, y_pos + 5)
+                canvas.create_text(x1, y_pos + 15, text=str(round(self.t0 + start / self.scale)))
+                last_tick = x1
+
+        # Final time marker, when the end of the run is in view
+        if self.t0 + self.visible_time() >= self.total_time:
+            canvas.create_line(right, y_pos, right, y_pos + 5)
+            canvas.create_text(right, y_pos + 15, text=str(self.total_time))
+
+        if self.scrollbar is not None:
+            self.scrollbar.set(self.t0 / self.total_time,
+                               min(1, (self.t0 + self.visible_time()) / self.total_time))
@@ -0,0 +1,124 @@
+import argparse
+from array import array
+
+import numpy as np
+
+from workload import Workload
+
+ARRIVALS = ("poisson", "bursty")
+BURSTS = ("exponential", "lognormal", "pareto")
+PRIORITIES = ("uniform", "geometric", "none")
+
+
+def _column(values):
+    # NumPy vector -> array("q") column, cast and copied straight into the
+    # array's buffer without a Python level loop or an intermediate bytes
+    # object
+    column = array("q", [0]) * len(values)
+    np.frombuffer(column, dtype=np.int64)[:] = values
+    return column
+
+
+def arrival_times(rng, n, kind="poisson", rate=1.0, burst_size=20.0):
+    # Poisson: exponential gaps with mean 1 / rate.
+    # Bursty: jobs come in groups of burst_size on average (geometric). Jobs
+    # in a group arrive together and groups are spread out so the long run
+    # rate is still `rate`.
+    if kind == "poisson":
+        gaps = rng.exponential(1.0 / rate, n)
+    elif kind == "bursty":
+        starts_group = rng.random(n) < 1.0 / burst_size
+        gaps = rng.exponential(burst_size / rate, n) * starts_group
+    else:
+        raise ValueError(f"Unknown arrival distribution: {kind}")
+    if n:
+        gaps[0] = 0.0  # The first job arrives at time 0
+    np.cumsum(gaps, out=gaps)
+    return np.floor(gaps, out=gaps)
+
+
+def burst_times(rng, n, kind="exponential", mean=10.0, sigma=1.0, alpha=2.5):
+    # Burst lengths with the given mean, rounded up so every burst is >= 1.
+    # sigma is the lognormal shape, alpha the Pareto tail index (> 1).
+    if kind == "exponential":
+        bursts = rng.exponential(mean, n)
+    elif kind == "lognormal":
+        mu = np.log(mean) - sigma ** 2 / 2
+        bursts = rng.lognormal(mu, sigma, n)
+    elif kind == "pareto":
+        if alpha <= 1:
+            raise ValueError("Pareto alpha must be > 1 for a finite mean")
+        scale = mean * (alpha - 1) / alpha
+        bursts = (rng.pareto(alpha, n) + 1) * scale
+    else:
+        raise ValueError(f"Unknown burst distribution: {kind}")
+    np.ceil(bursts, out=bursts)
+    return np.maximum(bursts, 1, out=bursts)
+
+
+def priorities(rng, n, kind="uniform", levels=10, p=0.5, weights=None):
+    # Priorities 1..levels (1 is the highest). Uniform, geometric (mostly
+    # high priority, P(k) ~ (1 - p) ** (k - 1)) or explicit per-level weights.
+    # "none" gives the NO_PRIORITY (0, "N/A") column that SJN workloads use.
+    if weights is not None:
+        weights = np.asarray(weights, dtype=float)
+        return rng.choice(np.arange(1, len(weights) + 1), n, p=weights / weights.sum())
+    if kind == "uniform":
+        return rng.integers(1, levels + 1, n)
+    if kind == "geometric":
+        return np.minimum(rng.geometric(p, n), levels)
+    if kind == "none":
+        return np.zeros(n, dtype=np.int64)
+    raise ValueError(f"Unknown priority distribution: {kind}")
+
+
+def generate_workload(n, seed=None, arrival="poisson", rate=1.0, burst_size=20.0,
+                      burst="exponential", mean_burst=10.0, sigma=1.0, alpha=2.5,
+                      priority="uniform", levels=10, p=0.5, weights=None):
+    # Seeded synthetic workload. Every column is drawn in one vectorized
+    # call, so the same arguments and seed always give the same Workload.
+    rng = np.random.default_rng(seed)
+    return Workload.adopt(
+        _column(np.arange(n, dtype=np.int64)),
+        _column(arrival_times(rng, n, arrival, rate, burst_size)),
+        _column(burst_times(rng, n, burst, mean_burst, sigma, alpha)),
+        _column(priorities(rng, n, priority, levels, p, weights)),
+    )
+
+
+def write_csv(workload, path):
+    # Same pid,arrival,burst,priority layout loader.load_workload reads. An
+    # all NO_PRIORITY column ("none") is left out, the loader reads that as
+    # no priorities while it rejects a priority of 0.
+    names = ["pid", "arrival", "burst", "priority"]
+    columns = [np.frombuffer(getattr(workload, name), dtype=np.int64) for name in names]
+    if not columns[3].any():
+        names, columns = names[:3], columns[:3]
+    np.savetxt(path, np.column_stack(columns), fmt="%d", delimiter=",",
+               header=",".join(names), comments="")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic workload as CSV")
+    parser.add_argument("n", type=int, help="Number of jobs")
+    parser.add_argument("output", help="CSV file to write")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--arrival", choices=ARRIVALS, default="poisson")
+    parser.add_argument("--rate", type=float, default=1.0, help="Jobs per time unit")
+    parser.add_argument("--burst-size", type=float, default=20.0, help="Mean group size for bursty arrivals")
+    parser.add_argument("--burst", choices=BURSTS, default="exponential")
+    parser.add_argument("--mean-burst", type=float, default=10.0)
+    parser.add_argument("--sigma", type=float, default=1.0, help="Lognormal shape")
+    parser.add_argument("--alpha", type=float, default=2.5, help="Pareto tail index")
+    parser.add_argument("--priority", choices=PRIORITIES, default="uniform")
+    parser.add_argument("--levels", type=int, default=10, help="Number of priority levels")
+
+    args = parser.parse_args(argv)
+    workload = generate_workload(
+        args.n, args.seed, args.arrival, args.rate, args.burst_size, args.burst,
+        args.mean_burst, args.sigma, args.alpha, args.priority, args.levels)
+    write_csv(workload, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+import csv
+import io
+import json
+from array import array
+from itertools import islice
+from operator import itemgetter
+
+import engine
+from workload import NO_PRIORITY, Workload
+
+# Rows parsed and validated per chunk
+CHUNK_SIZE = 65536
+
+# Accepted column names, the Process attribute names work too
+FIELDS = {
+    "pid": "pid", "process": "pid",
+    "arrival": "arrival", "arrival_time": "arrival",
+    "burst": "burst", "burst_time": "burst",
+    "priority": "priority",
+}
+
+
+class WorkloadError(ValueError):
+    # Raised for a row that breaks the input rules, with its line number
+    def __init__(self, line, message):
+        super().__init__(f"line {line}: {message}")
+        self.line = line
+
+
+def _int(value, line, name):
+    if isinstance(value, (bool, float)):
+        raise WorkloadError(line, f"{name} must be an integer, got {value!r}")
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise WorkloadError(line, f"{name} must be an integer, got {value!r}") from None
+
+
+def _csv_records(f):
+    # (line, pid, arrival, burst, priority) from CSV, header line optional.
+    # Without a header the columns are pid,arrival,burst[,priority].
+    pick = itemgetter(0, 1, 2, 3)
+    width = 4
+    first_row = True
+    for line, row in enumerate(csv.reader(f), 1):
+        if not row or not "".join(row).strip():
+            continue
+        if first_row:
+            first_row = False
+            if not row[0].strip().lstrip("P").lstrip("-").isdigit():
+                columns = [FIELDS.get(name.strip().lower()) for name in row]
+                if "arrival" not in columns or "burst" not in columns:
+                    raise WorkloadError(line, "header needs arrival and burst columns")
+                # Missing columns point one past the end, which is padded with None
+                pick = itemgetter(*(columns.index(name) if name in columns else len(columns)
+                                    for name in ("pid", "arrival", "burst", "priority")))
+                width = len(columns) + 1
+                continue
+        if len(row) < width:
+            row += [None] * (width - len(row))
+        yield (line, *pick(row))
+
+
+def _jsonl_records(f):
+    # (line, pid, arrival, burst, priority) from one JSON object per line
+    for line, text in enumerate(f, 1):
+        if not text.strip():
+            continue
+        try:
+            obj = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise WorkloadError(line, f"invalid JSON ({e.msg})") from None
+        if not isinstance(obj, dict):
+            raise WorkloadError(line, "expected a JSON object")
+        record = {FIELDS[key]: value for key, value in obj.items() if key in FIELDS}
+        yield line, record.get("pid"), record.get("arrival"), record.get("burst"), record.get("priority")
+
+
+def _check_row(line, p, a, b, pr, needs_priority, next_pid):
+    # Row by row validation, the same rules as get_user_input
+    a = _int(a, line, "Arrival Time")
+    b = _int(b, line, "Burst Time")
+    if a < 0 or b <= 0:
+        raise WorkloadError(line, "Arrival Time must be >= 0 and Burst Time must be > 0")
+    if pr is None or pr == "":
+        if needs_priority:
+            raise WorkloadError(line, "Priority is required")
+        pr = NO_PRIORITY
+    else:
+        pr = _int(pr, line, "Priority")
+        if pr <= 0:
+            raise WorkloadError(line, "Priority must be > 0")
+    if p is None or p == "":
+        p = next_pid
+    else:
+        p = _int(str(p).strip().lstrip("P"), line, "pid")
+    return p, a, b, pr
+
+
+def _slow_chunk(rows, needs_priority, next_pid):
+    pid, arrival, burst, priority = array("q"), array("q"), array("q"), array("q")
+    for row in rows:
+        p, a, b, pr = _check_row(*row, needs_priority, next_pid)
+        next_pid = p + 1
+        pid.append(p)
+        arrival.append(a)
+        burst.append(b)
+        priority.append(pr)
+    return pid, arrival, burst, priority
+
+
+def _fast_chunk(rows, convert, needs_priority, next_pid):
+    # Whole-column conversion and checks for the common case of a clean
+    # chunk. Returns None as soon as anything is off, the caller then goes
+    # through _slow_chunk to report the exact row.
+    _, p, a, b, pr = zip(*rows)
+    try:
+        arrival = array("q", map(convert, a))
+        burst = array("q", map(convert, b))
+        if None in pr or "" in pr:
+            if needs_priority or any(x is not None and x != "" for x in pr):
+                return None
+            priority = array("q", bytes(8 * len(rows)))
+        else:
+            priority = array("q", map(convert, pr))
+            if min(priority) <= 0:
+                return None
+        if None in p or "" in p:
+            if any(x is not None and x != "" for x in p):
+                return None
+            pid = array("q", range(next_pid, next_pid + len(rows)))
+        else:
+            pid = array("q", (int(str(x).strip().lstrip("P")) for x in p))
+    except (TypeError, ValueError):
+        return None
+    if min(arrival) < 0 or min(burst) <= 0:
+        return None
+    return pid, arrival, burst, priority
+
+
+def _strict_int(value):
+    # JSON values are already numbers, only real ints are accepted
+    if type(value) is not int:
+        raise TypeError
+    return value
+
+
+def read_chunks(f, fmt="csv", algorithm=None, chunk_size=CHUNK_SIZE):
+    # iter_chunks on an open text file (or io.StringIO) in the given format
+    needs_priority = algorithm is not None and algorithm not in engine.NO_PRIORITY_ALGORITHMS
+    convert = _strict_int if fmt == "jsonl" else int
+    next_pid = 0
+
+    records = _jsonl_records(f) if fmt == "jsonl" else _csv_records(f)
+    while True:
+        rows = list(islice(records, chunk_size))
+        if not rows:
+            return
+
+        chunk = _fast_chunk(rows, convert, needs_priority, next_pid)
+        if chunk is None:
+            chunk = _slow_chunk(rows, needs_priority, next_pid)
+        next_pid = chunk[0][-1] + 1
+        yield chunk
+
+
+def iter_chunks(path, algorithm=None, chunk_size=CHUNK_SIZE, fmt=None):
+    # Stream a CSV or JSONL trace as (pid, arrival, burst, priority) array
+    # chunks. Every row is checked with the same rules as get_user_input:
+    # arrival >= 0, burst > 0, and priority > 0, where priority may only be
+    # left out for SJN. Rows without a pid are numbered in file order.
+    if fmt is None:
+        fmt = "jsonl" if str(path).endswith((".jsonl", ".json", ".ndjson")) else "csv"
+    with open(path, newline="") as f:
+        yield from read_chunks(f, fmt, algorithm, chunk_size)
+
+
+def _collect(chunks):
+    # Chunks straight into the columns of one Workload
+    pid, arrival, burst, priority = array("q"), array("q"), array("q"), array("q")
+    for chunk in chunks:
+        pid.extend(chunk[0])
+        arrival.extend(chunk[1])
+        burst.extend(chunk[2])
+        priority.extend(chunk[3])
+    return Workload.adopt(pid, arrival, burst, priority)
+
+
+def load_workload(path, algorithm=None, chunk_size=CHUNK_SIZE, fmt=None):
+    # Read a whole trace into a Workload, chunk by chunk
+    return _collect(iter_chunks(path, algorithm, chunk_size, fmt))
+
+
+def parse_workload(text, algorithm=None):
+    # Workload from pasted text: JSON lines, or CSV where tab separated
+    # spreadsheet cells are accepted as well
+    if text.lstrip().startswith("{"):
+        fmt = "jsonl"
+    else:
+        fmt = "csv"
+        if "\t" in text and "," not in text:
+            text = text.replace("\t", ",")
+    return _collect(read_chunks(io.StringIO(text, newline=""), fmt, algorithm))
@@ -0,0 +1,170 @@
+# Values below 2 ** SUB_BUCKET_BITS are counted exactly, larger ones in
+# 2 ** (SUB_BUCKET_BITS - 1) buckets per power of two, so a reported
+# percentile is within 1 / 2 ** SUB_BUCKET_BITS of the true value
+SUB_BUCKET_BITS = 8
+_EXACT = 1 << SUB_BUCKET_BITS
+_HALF = _EXACT >> 1
+
+# Slowdown (turnaround / burst) is a ratio, it is kept in hundredths so it
+# fits the integer histogram
+SLOWDOWN_SCALE = 100
+
+
+class LogHistogram:
+    # Streaming quantile sketch for non-negative integers. Memory depends on
+    # the range of the values (at most a few thousand buckets for 64-bit
+    # values), never on how many were added.
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def add(self, value):
+        if value < _EXACT:
+            index = value
+        else:
+            shift = value.bit_length() - SUB_BUCKET_BITS
+            index = shift * _HALF + (value >> shift)
+        counts = self.counts
+        counts[index] = counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def mean(self):
+        return self.total / self.count if self.count else 0
+
+    def quantile(self, p):
+        # Nearest-rank percentile, like batch.percentile, reported as the
+        # middle of its bucket (never above the largest value seen)
+        if not self.count:
+            return 0
+        rank = max(1, -(-p * self.count // 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                break
+        if index < _EXACT:
+            return index
+        shift = index // _HALF - 1
+        low = (index - shift * _HALF) << shift
+        return min(low + (1 << shift) // 2, self.max)
+
+
+class RunMetrics:
+    # Online report of one run: jobs are added one at a time as they finish
+    # and nothing per job is kept, so the report of a 100M job run takes the
+    # same memory as that of a 10 job run.
+    __slots__ = ("turnaround", "waiting", "response", "slowdown",
+                 "first_arrival", "last_completion")
+
+    def __init__(self):
+        self.turnaround = LogHistogram()
+        self.waiting = LogHistogram()
+        self.response = LogHistogram()  # First dispatch - arrival
+        self.slowdown = LogHistogram()  # Turnaround / burst, in SLOWDOWN_SCALE units
+        self.first_arrival = None
+        self.last_completion = 0
+
+    def add_job(self, arrival, burst, completion, first_start=None):
+        # first_start is when the job first got the CPU, response time is
+        # left out for jobs where it is not known
+        turnaround = completion - arrival
+        self.turnaround.add(turnaround)
+        self.waiting.add(turnaround - burst)
+        self.slowdown.add(turnaround * SLOWDOWN_SCALE // burst)
+        if first_start is not None:
+            self.response.add(first_start - arrival)
+        if self.first_arrival is None or arrival < self.first_arrival:
+            self.first_arrival = arrival
+        if completion > self.last_completion:
+            self.last_completion = completion
+
+    def merge(self, other):
+        for name in ("turnaround", "waiting", "response", "slowdown"):
+            getattr(self, name).merge(getattr(other, name))
+        if other.first_arrival is not None:
+            if self.first_arrival is None or other.first_arrival < self.first_arrival:
+                self.first_arrival = other.first_arrival
+        self.last_completion = max(self.last_completion, other.last_completion)
+
+    def __len__(self):
+        return self.turnaround.count
+
+    def throughput(self):
+        # Completed jobs per time unit, from the first arrival to the last
+        # completion
+        span = self.last_completion - (self.first_arrival or 0)
+        return len(self) / span if span else 0
+
+    def report(self):
+        # Flat dict in the batch table row format
+        row = {"jobs": len(self), "throughput": self.throughput(),
+               "makespan": self.last_completion,
+               "avg_tat": self.turnaround.mean(), "p99_tat": self.turnaround.quantile(99)}
+        for prefix, histogram in (("wt", self.waiting), ("rt", self.response)):
+            row[f"avg_{prefix}"] = histogram.mean()
+            for p in (50, 95, 99):
+                row[f"p{p}_{prefix}"] = histogram.quantile(p)
+            row[f"max_{prefix}"] = histogram.max
+        row["avg_slowdown"] = self.slowdown.mean() / SLOWDOWN_SCALE
+        for p in (50, 95, 99):
+            row[f"p{p}_slowdown"] = self.slowdown.quantile(p) / SLOWDOWN_SCALE
+        row["max_slowdown"] = self.slowdown.max / SLOWDOWN_SCALE
+        return row
+
+
+REPORT_COLUMNS = ["jobs", "throughput", "avg_wt", "p50_wt", "p95_wt", "p99_wt", "max_wt",
+                  "avg_rt", "p95_rt", "p99_rt", "max_rt", "avg_slowdown", "p99_slowdown"]
+
+
+def track(segments, workload, completion, metrics, first_start=None):
+    # Pass an engine stream (engine.stream) through unchanged while adding
+    # every job to metrics as it completes. Only jobs that have started but
+    # not finished are remembered, for their first dispatch time, in
+    # first_start (job -> time), which a caller can pass in to keep or
+    # checkpoint it.
+    arrival, burst = workload.arrival, workload.burst
+    if first_start is None:
+        first_start = {}
+    for segment in segments:
+        j, start, end = segment
+        first = first_start.pop(j, start)
+        if completion[j] == end:
+            metrics.add_job(arrival[j], burst[j], end, first)
+        else:
+            first_start[j] = first
+        yield segment
+
+
+def measure(result):
+    # RunMetrics of a finished Result
+    metrics = RunMetrics()
+    for _ in track(result.execution_log, result.workload, result.completion, metrics):
+        pass
+    return metrics
+
+
+def print_report(metrics):
+    # Tail lines for the text front ends, under their totals and averages
+    row = metrics.report()
+    print(f"Waiting Time p50/p95/p99/max: {row['p50_wt']}/{row['p95_wt']}/"
+          f"{row['p99_wt']}/{row['max_wt']}")
+    if metrics.response.count:
+        print(f"Response Time p50/p95/p99/max: {row['p50_rt']}/{row['p95_rt']}/"
+              f"{row['p99_rt']}/{row['max_rt']}")
+    print(f"Slowdown avg/p99/max: {row['avg_slowdown']:.2f}/{row['p99_slowdown']:.2f}/"
+          f"{row['max_slowdown']:.2f}")
+    print(f"Throughput: {row['throughput']:.4f} jobs per time unit")
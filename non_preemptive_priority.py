@@ -1,3 +1,6 @@
+import engine
+
+
 class Process:
     def __init__(self, pid, arrival_time, burst_time, priority):
         self.pid = pid
@@ -10,32 +13,10 @@ class Process:
 
 
 def non_preemptive_priority_scheduling(processes):
-    time = 0
-    completed = 0
     n = len(processes)
-    gantt_chart = []
-
-    while completed != n:
-        # Select the process with the highest priority that is ready to execute
-        current_process = None
-        for process in processes:
-            if process.arrival_time <= time and process.completion_time == 0:
-                if (current_process is None or 
-                    process.priority < current_process.priority or 
-                    (process.priority == current_process.priority and process.arrival_time < current_process.arrival_time)):
-                    current_process = process
-
-        if current_process:
-            # Execute the process to completion
-            gantt_chart.extend([f"P{current_process.pid}"] * current_process.burst_time)
-            time += current_process.burst_time
-            current_process.completion_time = time
-            current_process.turnaround_time = current_process.completion_time - current_process.arrival_time
-            current_process.waiting_time = current_process.turnaround_time - current_process.burst_time
-            completed += 1
-        else:
-            # No process is ready to execute; increment time
-            time += 1
+
+    # Highest priority first, then earliest arrival, then input order
+    execution_log = engine.schedule(processes, "NP", tie_break="arrival")
 
     # Output results with centered table
     header = [
@@ -69,7 +50,9 @@ def non_preemptive_priority_scheduling(processes):
     print("Average Waiting Time: {:.2f}".format(avg_waiting_time))
 
     print("\nGantt Chart:")
-    print(" -> ".join(gantt_chart))
+    # One entry per run of a process rather than one per time unit
+    print(" -> ".join(f"P{pid} ({start_time}-{end_time})"
+                      for pid, start_time, end_time in execution_log))
 
 
 def get_user_input():
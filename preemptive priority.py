@@ -1,3 +1,6 @@
+import engine
+
+
 class Process:
     def __init__(self, pid, arrival_time, burst_time, priority):
         self.pid = pid
@@ -11,37 +14,11 @@ class Process:
 
 
 def preemptive_priority_scheduling(processes):
-    time = 0
-    completed = 0
     n = len(processes)
-    gantt_chart = []
-
-    while completed != n:
-        current_process = None
-        for process in processes:
-            if process.arrival_time <= time and process.remaining_time > 0:
-                if (current_process is None or 
-                    process.priority < current_process.priority or 
-                    (process.priority == current_process.priority and process.arrival_time < current_process.arrival_time)):
-                    current_process = process
 
-        if current_process:
-            current_process.remaining_time -= 1
-            time += 1
-            gantt_chart.append(f"P{current_process.pid}")
+    # Highest priority first, then earliest arrival, then input order
+    execution_log = engine.schedule(processes, "PP", tie_break="arrival")
 
-            if current_process.remaining_time == 0:
-                completed += 1
-                current_process.completion_time = time
-                current_process.turnaround_time = current_process.completion_time - current_process.arrival_time
-                current_process.waiting_time = current_process.turnaround_time - current_process.burst_time
-        else:
-            if any(p.remaining_time > 0 and p.arrival_time > time for p in processes):
-                time = min(p.arrival_time for p in processes if p.remaining_time > 0 and p.arrival_time > time)
-            else:
-                time += 1
-
-   
     print("PID\tArrival Time\tBurst Time\tPriority\tCompletion Time\tTurnaround Time\tWaiting Time")
     total_turnaround_time = 0
     total_waiting_time = 0
@@ -61,7 +38,9 @@ def preemptive_priority_scheduling(processes):
 
     
     print("\nGantt Chart:")
-    print(" -> ".join(gantt_chart))
+    # One entry per run of a process rather than one per time unit
+    print(" -> ".join(f"P{pid} ({start_time}-{end_time})"
+                      for pid, start_time, end_time in execution_log))
 
 
 def get_user_input():
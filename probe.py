@@ -0,0 +1,96 @@
+# Scheduler events, with the arguments their callbacks get:
+#   dispatch(job, time)    job gets the CPU
+#   preempt(job, time)     job loses the CPU before it is done (a higher
+#                          ranked arrival, or the end of its time quantum)
+#   complete(job, time)    job finishes
+#   idle(start, end)       nothing to run, the engine jumps to the next arrival
+EVENTS = ("dispatch", "preempt", "complete", "idle")
+
+# Counted by the engine as it works:
+#   dispatches        select() calls, one per scheduling decision
+#   admissions        arrivals handed to the ready queue
+#   requeues          stopped jobs handed back to it
+#   preempt_checks    arrivals tested against the running job
+#   idle_jumps        jumps of the clock over idle time to the next arrival
+#   ticks             iterations of the engine loop
+# and read off the segments it yields:
+#   preemptions, completions, context_switches, idle_time
+COUNTERS = ("dispatches", "admissions", "requeues", "preempt_checks", "preemptions",
+            "completions", "context_switches", "idle_jumps", "idle_time", "ticks")
+
+
+class Probe:
+    # Counters and event callbacks for one run. engine.iter_policy counts
+    # the policy calls and its own loop into the probe (see counted), and
+    # the probe watches the segments it yields for the rest (see watch). A
+    # run without a probe only pays for one None check per loop iteration.
+    #
+    # ticks against the simulated time shows how much a time-stepped
+    # scheduler, which would loop once per time unit, does that the event
+    # driven engine skips.
+    def __init__(self):
+        self.subscribers = {event: [] for event in EVENTS}
+        self.reset()
+
+    def reset(self):
+        for name in COUNTERS:
+            setattr(self, name, 0)
+
+    def subscribe(self, event, callback):
+        if event not in self.subscribers:
+            raise ValueError(f"Unknown event: {event}")
+        self.subscribers[event].append(callback)
+
+    def counters(self):
+        return {name: getattr(self, name) for name in COUNTERS}
+
+    def counted(self, admit, select, requeue, preempt):
+        # The policy calls of iter_policy, counting themselves
+        def counted_admit(j):
+            self.admissions += 1
+            admit(j)
+
+        def counted_select():
+            self.dispatches += 1
+            return select()
+
+        def counted_requeue(j):
+            self.requeues += 1
+            requeue(j)
+
+        def counted_preempt(j, k, left):
+            self.preempt_checks += 1
+            return preempt(j, k, left)
+
+        return (counted_admit, counted_select, counted_requeue,
+                None if preempt is None else counted_preempt)
+
+    def watch(self, segments, completion):
+        # Pass (job, start, end) segments through unchanged, counting and
+        # firing events on the way. completion is the array the engine fills
+        # in, a job is done when its completion time equals a segment end.
+        on_dispatch, on_preempt, on_complete, on_idle = (
+            self.subscribers[event] for event in EVENTS)
+        previous = None
+        last_end = 0
+        for segment in segments:
+            j, start, end = segment
+            if start > last_end:
+                self.idle_time += start - last_end
+                for callback in on_idle:
+                    callback(last_end, start)
+            if previous is not None and j != previous:
+                self.context_switches += 1
+            for callback in on_dispatch:
+                callback(j, start)
+            if completion[j] == end:
+                self.completions += 1
+                for callback in on_complete:
+                    callback(j, end)
+            else:
+                self.preemptions += 1
+                for callback in on_preempt:
+                    callback(j, end)
+            previous = j
+            last_end = end
+            yield segment
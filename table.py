@@ -0,0 +1,90 @@
+from tkinter import ttk
+
+
+class VirtualTable:
+    # Treeview that only ever holds the rows on screen. Row values come from
+    # row(index) and are filled in when a row scrolls into view, so showing
+    # or refreshing a table of any length costs one screenful of item
+    # updates. Scrolling and selection are tracked by row index.
+    def __init__(self, parent, columns, row, height=10):
+        self.row = row
+        self.height = height
+        self.count = 0
+        self.top = 0
+        self.selected = None
+
+        self.tree = ttk.Treeview(parent, columns=columns, show="headings", height=height,
+                                 selectmode="browse")
+        self.scrollbar = ttk.Scrollbar(parent, orient="vertical", command=self.yview)
+        self.tree.bind("<<TreeviewSelect>>", self.on_select)
+        self.tree.bind("<MouseWheel>", self.on_wheel)  # Windows and macOS
+        self.tree.bind("<Button-4>", self.on_wheel)  # X11
+        self.tree.bind("<Button-5>", self.on_wheel)
+        self.tree.bind("<Up>", lambda event: self.move(-1))
+        self.tree.bind("<Down>", lambda event: self.move(1))
+        self.tree.bind("<Prior>", lambda event: self.move(-height))
+        self.tree.bind("<Next>", lambda event: self.move(height))
+
+    def set_count(self, count, follow=False):
+        # New row count; follow scrolls to the end, to show rows just added
+        self.count = count
+        if self.selected is not None and self.selected >= count:
+            self.selected = None
+        if follow:
+            self.top = count - self.height
+        self.refresh()
+
+    def refresh(self):
+        # Rewrite the visible rows, all other rows only exist as row(index)
+        self.top = max(0, min(self.top, self.count - self.height))
+        tree = self.tree
+        items = tree.get_children()
+        visible = min(self.height, self.count - self.top)
+        if len(items) > visible:
+            tree.delete(*items[visible:])
+            items = items[:visible]
+        for offset, item in enumerate(items):
+            tree.item(item, values=self.row(self.top + offset))
+        items = list(items)
+        for offset in range(len(items), visible):
+            items.append(tree.insert("", "end", values=self.row(self.top + offset)))
+
+        if self.selected is not None and self.top <= self.selected < self.top + visible:
+            tree.selection_set(items[self.selected - self.top])
+        elif tree.selection():
+            tree.selection_set(())
+        if self.count > self.height:
+            self.scrollbar.set(self.top / self.count, (self.top + visible) / self.count)
+        else:
+            self.scrollbar.set(0, 1)
+
+    def yview(self, *args):
+        # Scrollbar command: ("moveto", fraction) or ("scroll", n, "units"|"pages")
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * self.count)
+        elif args[0] == "scroll":
+            self.top += int(args[1]) * (self.height if args[2] == "pages" else 1)
+        self.refresh()
+
+    def on_wheel(self, event):
+        up = event.num == 4 or getattr(event, "delta", 0) > 0
+        self.yview("scroll", -3 if up else 3, "units")
+        return "break"
+
+    def on_select(self, event):
+        selection = self.tree.selection()
+        if selection:
+            self.selected = self.top + self.tree.index(selection[0])
+
+    def move(self, step):
+        # Keyboard navigation past the first or last visible row scrolls
+        if not self.count:
+            return "break"
+        index = 0 if self.selected is None else self.selected + step
+        self.selected = max(0, min(index, self.count - 1))
+        if self.selected < self.top:
+            self.top = self.selected
+        elif self.selected >= self.top + self.height:
+            self.top = self.selected - self.height + 1
+        self.refresh()
+        return "break"
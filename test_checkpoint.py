@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+import batch
+import checkpoint
+import tracefile
+from workload import Workload
+
+
+class Killed(Exception):
+    pass
+
+
+class DyingCheckpointer(checkpoint.Checkpointer):
+    # Saves like a Checkpointer, then the process "dies" at save number
+    # dies_at, with output written past the last checkpoint
+    def __init__(self, path, dies_at, **intervals):
+        super().__init__(path, **intervals)
+        self.dies_at = dies_at
+
+    def save(self, engine_state):
+        if self.saves == self.dies_at:
+            raise Killed()
+        super().save(engine_state)
+
+
+def _workload(seed, n=300):
+    rng = random.Random(seed)
+    arrival = sorted(rng.randint(0, 3 * n) for _ in range(n))
+    return Workload.from_columns(arrival, [rng.randint(1, 12) for _ in range(n)],
+                                 [rng.randint(1, 5) for _ in range(n)])
+
+
+@pytest.mark.parametrize("algorithm, params", [
+    ("RR", {"time_quantum": 3}),
+    ("RR", {"time_quantum": 2, "tie_break": "hungry"}),
+    ("PP", {}),
+    ("PP", {"aging_rate": "1/3", "tie_break": "hungry"}),
+    ("MLFQ", {}),
+    ("MLFQ", {"quanta": [2, 5], "boost_interval": 37}),
+])
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_resume_matches_uninterrupted_run(tmp_path, algorithm, params, seed):
+    workload = _workload(seed)
+    every = 7 * seed
+
+    full_log, full_trace = tmp_path / "full.csv", tmp_path / "full.trace"
+    with open(full_log, "w") as log_file, \
+            tracefile.TraceWriter(str(full_trace), algorithm, params, workload.pid) as trace:
+        expected = batch.run_streaming(workload, algorithm, log_file, trace, **params)
+
+    path, log, trace_path = str(tmp_path / "run.ck"), tmp_path / "run.csv", str(tmp_path / "run.trace")
+    log_file = open(log, "w")
+    trace = tracefile.TraceWriter(trace_path, algorithm, params, workload.pid)
+    saver = DyingCheckpointer(path, 3, every_time=every)
+    resume = None
+    resumes = 0
+    while True:
+        try:
+            row = batch.run_streaming(workload, algorithm, log_file, trace, None, saver, resume,
+                                      **params)
+        except Killed:
+            # Unflushed output is lost with the process
+            log_file.close()
+            trace.file.close()
+        else:
+            log_file.close()
+            trace.close()
+            break
+        resume = checkpoint.load(path)
+        resumes += 1
+        log_file = open(log, "r+")
+        log_file.seek(resume["log_offset"])
+        log_file.truncate()
+        trace = tracefile.TraceWriter.reopen(trace_path, *resume["trace"], workload.pid)
+        saver = DyingCheckpointer(path, 2, every_time=every)
+
+    assert resumes
+    assert row == expected
+    assert log.read_text() == full_log.read_text()
+    with tracefile.TraceReader(trace_path) as resumed, tracefile.TraceReader(str(full_trace)) as full:
+        assert list(resumed) == list(full)
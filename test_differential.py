@@ -0,0 +1,49 @@
+import pytest
+
+import differential
+import engine
+
+
+def _never_preempts(policy, workload, params):
+    policy.preempt = None
+    return policy
+
+
+def _inverted_priority(policy, workload, params):
+    return engine.RankPolicy([-p for p in workload.priority], False, workload.arrival,
+                             params.get("tie_break", "index"))
+
+
+def _longer_quantum(policy, workload, params):
+    policy.time_quantum += 1
+    return policy
+
+
+@pytest.mark.parametrize("tie_break", list(engine.TIE_BREAKS))
+@pytest.mark.parametrize("group", list(differential.IMPLEMENTATIONS))
+def test_implementations_agree(group, tie_break):
+    if group == "MLFQ" and tie_break != "index":
+        pytest.skip("MLFQ levels are FIFO")
+    assert differential.check(group, trials=200, tie_break=tie_break) is None
+
+
+@pytest.mark.parametrize("algorithm, breaks, reference", [
+    ("PP", _never_preempts, "priority_ticks"),
+    ("NP", _inverted_priority, "priority_list"),
+    ("RR", _longer_quantum, "rr_list"),
+])
+@pytest.mark.parametrize("tie_break", ["index", "arrival"])
+@pytest.mark.parametrize("ties", [True, False])
+def test_broken_policy_is_caught(monkeypatch, algorithm, breaks, reference, tie_break, ties):
+    # Everything but the reference runs on the engine, so only the
+    # reference can tell the broken policy apart
+    make_policy = engine.make_policy
+
+    def broken(workload, code, params):
+        policy = make_policy(workload, code, params)
+        return breaks(policy, workload, params) if code == algorithm else policy
+
+    monkeypatch.setattr(engine, "make_policy", broken)
+    found = differential.check(algorithm, trials=200, ties=ties, tie_break=tie_break)
+    assert found is not None
+    assert found[2] == ("engine", reference)
@@ -1,18 +1,8 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from typing import List
-import copy
-
-class Process:
-    def __init__(self, pid, arrival_time, burst_time, priority=None):
-        self.pid = f"P{pid}"
-        self.arrival_time = arrival_time
-        self.burst_time = burst_time
-        self.priority = priority
-        self.remaining_time = burst_time
-        self.completion_time = 0
-        self.turnaround_time = 0
-        self.waiting_time = 0
+import engine
+from workload import JobSpec
 
 class CPUSchedulerGUI:
     def __init__(self, root):
@@ -23,7 +13,7 @@ class CPUSchedulerGUI:
         # Variables
         self.algorithm = tk.StringVar(value="SJN")
         self.time_quantum = tk.StringVar(value="2")
-        self.processes: List[Process] = []
+        self.processes: List[JobSpec] = []
         
         self.create_widgets()
         
@@ -40,6 +30,10 @@ class CPUSchedulerGUI:
                        variable=self.algorithm, value="NP").pack(side="left", padx=5)
         ttk.Radiobutton(algo_frame, text="Preemptive Priority", 
                        variable=self.algorithm, value="PP").pack(side="left", padx=5)
+        ttk.Radiobutton(algo_frame, text="Shortest Remaining Time First (SRTF)", 
+                       variable=self.algorithm, value="SRTF").pack(side="left", padx=5)
+        ttk.Radiobutton(algo_frame, text="Multi-level Feedback Queue (MLFQ)", 
+                       variable=self.algorithm, value="MLFQ").pack(side="left", padx=5)
         
         # Time Quantum Frame (for RR)
         self.tq_frame = ttk.LabelFrame(self.root, text="Time Quantum", padding=10)
@@ -127,7 +121,7 @@ class CPUSchedulerGUI:
                 raise ValueError("Invalid input values")
             
             pid = len(self.processes)
-            process = Process(pid, arrival, burst, priority)
+            process = JobSpec(f"P{pid}", arrival, burst, priority)
             self.processes.append(process)
             
             self.tree.insert("", "end", values=(process.pid, arrival, burst, 
@@ -197,14 +191,10 @@ class CPUSchedulerGUI:
         for item in self.results_tree.get_children():
             self.results_tree.delete(item)
         
-        # Create copy of processes for simulation
-        processes = copy.deepcopy(self.processes)
-        
-        # Run selected algorithm
+        # Run selected algorithm, the job specs themselves are never modified
         algorithm = self.algorithm.get()
-        if algorithm == "SJN":
-            execution_log = sjn_scheduling(processes)
-        elif algorithm == "RR":
+        params = {}
+        if algorithm == "RR":
             try:
                 time_quantum = int(self.time_quantum.get())
                 if time_quantum <= 0:
@@ -212,31 +202,23 @@ class CPUSchedulerGUI:
             except ValueError:
                 messagebox.showerror("Error", "Please enter a valid time quantum")
                 return
-            execution_log = round_robin_scheduling(processes, time_quantum)
-        elif algorithm == "NP":
-            execution_log = priority_scheduling(processes, preemptive=False)
-        else:  # PP
-            execution_log = priority_scheduling(processes, preemptive=True)
+            params["time_quantum"] = time_quantum
+        result = engine.simulate(self.processes, algorithm, **params)
         
         # Update results table
-        for process in processes:
+        for pid, arrival, burst, priority, completion, turnaround, waiting in result.rows():
             self.results_tree.insert("", "end", values=(
-                process.pid, process.arrival_time, process.burst_time,
-                process.priority if process.priority is not None else "N/A",
-                process.completion_time, process.turnaround_time, process.waiting_time
+                pid, arrival, burst,
+                priority if priority is not None else "N/A",
+                completion, turnaround, waiting
             ))
         
         # Draw Gantt chart
-        self.draw_gantt_chart(execution_log)
-        
-        # Calculate and display metrics
-        total_tat = sum(p.turnaround_time for p in processes)
-        total_wt = sum(p.waiting_time for p in processes)
-        avg_tat = total_tat / len(processes)
-        avg_wt = total_wt / len(processes)
+        self.draw_gantt_chart(result.pid_log())
         
-        self.metrics_label.config(text=f"Average Turnaround Time: {avg_tat:.2f} | "
-                                     f"Average Waiting Time: {avg_wt:.2f}")
+        # Display metrics
+        self.metrics_label.config(text=f"Average Turnaround Time: {result.average_turnaround():.2f} | "
+                                     f"Average Waiting Time: {result.average_waiting():.2f}")
 
 def main():
     root = tk.Tk()
@@ -0,0 +1,303 @@
+import json
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from fractions import Fraction
+
+import engine
+import metrics
+from workload import Workload
+
+# Binary execution log ("trace") layout, all integers little endian:
+#
+#   header   MAGIC, uint32 length, JSON {"algorithm", "params"}, padded to 8
+#   blocks   uint32 count, uint32 0, then three columns of count entries:
+#            int32 job, int64 start, int64 end (the job column padded to 8)
+#   pids     int64 pid of every job id, in id order
+#   trailer  uint64 pid table offset, uint64 jobs, uint64 segments, END_MAGIC
+#
+# A segment costs 20 bytes on disk and nothing in memory until it is read.
+# Job ids index the pid table, the engines' row indices can be written as
+# they are.
+MAGIC = b"CPUTRACE"
+END_MAGIC = b"CPUTEND\0"
+BLOCK_SIZE = 65536  # Segments per block
+MAX_JOBS = 2 ** 31 - 1
+
+# Params written as strings (a Fraction aging_rate), read back as Fractions
+FRACTION_PARAMS = ("aging_rate",)
+
+_BLOCK_HEADER = struct.Struct("<II")
+_TRAILER = struct.Struct("<QQQ8s")
+
+if sys.byteorder != "little":
+    raise ImportError("tracefile only supports little endian machines")
+
+
+def _padding(size):
+    return -size % 8
+
+
+def _header(algorithm, params):
+    # JSON header of a trace, built before the file is created so bad params
+    # never leave a half written trace behind
+    params = {name: str(value) if isinstance(value, Fraction) else value
+              for name, value in dict(params or {}).items()}
+    try:
+        return json.dumps({"algorithm": algorithm, "params": params}).encode()
+    except TypeError as e:
+        raise ValueError(f"Trace params must be JSON types or Fractions: {e}") from None
+
+
+class TraceWriter:
+    # Appends segments to a trace file as they come, one block at a time.
+    # pids is the pid table when job ids are already known (workload.pid for
+    # engine row indices); otherwise pids are interned with job_id().
+    def __init__(self, path, algorithm, params=None, pids=None, block_size=BLOCK_SIZE):
+        header = _header(algorithm, params)
+        self.block_size = block_size
+        self.pids = array("q", () if pids is None else pids)
+        self.ids = None if pids is not None else {}
+        self.count = 0
+        self.jobs, self.starts, self.ends = array("i"), array("q"), array("q")
+        self.file = open(path, "wb")
+        self.file.write(MAGIC + struct.pack("<I", len(header)) + header)
+        self.file.write(b"\0" * _padding(len(MAGIC) + 4 + len(header)))
+
+    @classmethod
+    def reopen(cls, path, offset, count, pids, block_size=BLOCK_SIZE):
+        # Carry on writing a trace that was cut off at offset after count
+        # segments (whole blocks only, see flush), e.g. from a checkpoint
+        self = cls.__new__(cls)
+        self.block_size = block_size
+        self.pids = array("q", pids)
+        self.ids = None
+        self.count = count
+        self.jobs, self.starts, self.ends = array("i"), array("q"), array("q")
+        self.file = open(path, "r+b")
+        self.file.seek(offset)
+        self.file.truncate()
+        return self
+
+    def job_id(self, pid):
+        # Interned id of a pid, "P3" or 3
+        pid = int(str(pid).lstrip("P"))
+        ids = self.ids
+        if ids is None:
+            raise ValueError("pid table was given up front, write job ids instead")
+        job = ids.get(pid)
+        if job is None:
+            job = ids[pid] = len(self.pids)
+            if job > MAX_JOBS:
+                raise ValueError("too many jobs for a trace file")
+            self.pids.append(pid)
+        return job
+
+    def write(self, job, start, end):
+        self.jobs.append(job)
+        self.starts.append(start)
+        self.ends.append(end)
+        if len(self.jobs) >= self.block_size:
+            self.flush()
+
+    def write_segments(self, segments):
+        # (job id, start, end) segments, e.g. an engine.stream()
+        for job, start, end in segments:
+            self.write(job, start, end)
+
+    def write_pid_log(self, execution_log):
+        # [pid, start, end] entries as the schedulers and Result.pid_log give them
+        for pid, start, end in execution_log:
+            self.write(self.job_id(pid), start, end)
+
+    def flush(self):
+        n = len(self.jobs)
+        if not n:
+            return
+        self.file.write(_BLOCK_HEADER.pack(n, 0))
+        self.jobs.tofile(self.file)
+        self.file.write(b"\0" * _padding(4 * n))
+        self.starts.tofile(self.file)
+        self.ends.tofile(self.file)
+        self.count += n
+        self.jobs, self.starts, self.ends = array("i"), array("q"), array("q")
+
+    def close(self):
+        if self.file.closed:
+            return
+        self.flush()
+        offset = self.file.tell()
+        self.pids.tofile(self.file)
+        self.file.write(_TRAILER.pack(offset, len(self.pids), self.count, END_MAGIC))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TraceReader:
+    # Memory-mapped view of a trace file. Opening only reads the header and
+    # the block headers; segments are paged in by the OS when they are read.
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path}: not a trace file")
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = self.view = memoryview(self.map)
+        if len(view) < len(MAGIC) + 4 + _TRAILER.size:
+            raise ValueError(f"{path}: trace file is truncated")
+        pid_offset, jobs, self.count, end_magic = _TRAILER.unpack_from(view, len(view) - _TRAILER.size)
+        if end_magic != END_MAGIC:
+            raise ValueError(f"{path}: trace file is truncated")
+        (length,) = struct.unpack_from("<I", view, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(bytes(view[start:start + length]))
+        self.algorithm = header["algorithm"]
+        self.params = {name: Fraction(value) if name in FRACTION_PARAMS and isinstance(value, str) else value
+                       for name, value in header["params"].items()}
+        self.pids = view[pid_offset:pid_offset + 8 * jobs].cast("q")
+
+        # (offset, count) of every block, plus the end time of each block's
+        # last segment for time lookups
+        self.blocks = []
+        self.block_ends = []
+        offset = start + length + _padding(start + length)
+        while offset < pid_offset:
+            n, _ = _BLOCK_HEADER.unpack_from(view, offset)
+            self.blocks.append((offset, n))
+            self.block_ends.append(self._columns(offset, n)[2][n - 1])
+            offset += _BLOCK_HEADER.size + 4 * n + _padding(4 * n) + 16 * n
+
+    def _columns(self, offset, n):
+        offset += _BLOCK_HEADER.size
+        jobs = self.view[offset:offset + 4 * n].cast("i")
+        offset += 4 * n + _padding(4 * n)
+        starts = self.view[offset:offset + 8 * n].cast("q")
+        ends = self.view[offset + 8 * n:offset + 16 * n].cast("q")
+        return jobs, starts, ends
+
+    def __len__(self):
+        return self.count
+
+    def columns(self):
+        # (jobs, starts, ends) memoryviews, one triple per block
+        for offset, n in self.blocks:
+            yield self._columns(offset, n)
+
+    def __iter__(self):
+        for jobs, starts, ends in self.columns():
+            yield from zip(jobs, starts, ends)
+
+    def between(self, t0, t1):
+        # Segments that overlap [t0, t1), found by bisecting the blocks,
+        # so a Gantt viewport only touches the part of the file it shows
+        for b in range(bisect_left(self.block_ends, t0 + 1), len(self.blocks)):
+            jobs, starts, ends = self._columns(*self.blocks[b])
+            for i in range(bisect_left(ends, t0 + 1), len(jobs)):
+                if starts[i] >= t1:
+                    return
+                yield jobs[i], starts[i], ends[i]
+
+    def makespan(self):
+        return self.block_ends[-1] if self.blocks else 0
+
+    def gantt_log(self):
+        # Result.pid_log style [pid, start, end] sequence for gantt.GanttView
+        return TraceLog(self)
+
+    def pid_log(self):
+        # [pid, start, end] entries, as Result.pid_log gives them
+        pids = self.pids
+        for job, start, end in self:
+            yield [f"P{pids[job]}", start, end]
+
+    def spans(self):
+        # First dispatch and completion time of every job id, one pass over
+        # the segments and memory per job rather than per segment
+        first = array("q", [-1]) * len(self.pids)
+        completion = array("q", bytes(8 * len(self.pids)))
+        for jobs, starts, ends in self.columns():
+            for job, start, end in zip(jobs, starts, ends):
+                if first[job] < 0:
+                    first[job] = start
+                completion[job] = end
+        return first, completion
+
+    def measure(self, workload):
+        # metrics.RunMetrics of the archived run. The trace holds no arrival
+        # or burst times, so the workload it was run on is needed, with job
+        # ids being its row indices.
+        if len(workload) != len(self.pids):
+            raise ValueError("workload does not match the trace's pid table")
+        first, completion = self.spans()
+        run = metrics.RunMetrics()
+        for j in range(len(workload)):
+            if completion[j]:
+                run.add_job(workload.arrival[j], workload.burst[j], completion[j], first[j])
+        return run
+
+    def close(self):
+        # A segment iterator that is still open holds views into the map,
+        # the map is then unmapped once the last of them is gone
+        self.pids.release()
+        self.view.release()
+        try:
+            self.map.close()
+        except BufferError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class TraceLog:
+    # Read-only sequence of the [pid, start, end] segments of a trace. Like
+    # between() it finds a segment through the block index, but by position,
+    # which is what gantt.layout bisects on: a Gantt chart of an archived run
+    # only reads the few segments it draws, however long the run. Entries
+    # are unpacked straight from the map, no views are held.
+    def __init__(self, reader):
+        self.reader = reader
+        self.firsts = array("q")  # Position of the first segment of each block
+        count = 0
+        for _, n in reader.blocks:
+            self.firsts.append(count)
+            count += n
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("trace segment out of range")
+        reader = self.reader
+        b = bisect_right(self.firsts, i) - 1
+        offset, n = reader.blocks[b]
+        k = i - self.firsts[b]
+        offset += _BLOCK_HEADER.size
+        (job,) = struct.unpack_from("<i", reader.map, offset + 4 * k)
+        offset += 4 * n + _padding(4 * n)
+        (start,) = struct.unpack_from("<q", reader.map, offset + 8 * k)
+        (end,) = struct.unpack_from("<q", reader.map, offset + 8 * (n + k))
+        return [f"P{reader.pids[job]}", start, end]
+
+
+def record(path, spec, algorithm, **params):
+    # Run an algorithm straight into a trace file, segment by segment. Returns
+    # the completion times (one int per job), the log never exists in memory.
+    workload = spec if isinstance(spec, Workload) else Workload.from_processes(spec)
+    completion = array("q", bytes(8 * len(workload)))
+    with TraceWriter(path, algorithm, params, workload.pid) as writer:
+        writer.write_segments(engine.stream(workload, algorithm, completion, **params))
+    return completion
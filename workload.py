@@ -0,0 +1,167 @@
+from array import array
+
+# Priority column value for processes without a priority (SJN input).
+# Valid priorities are always > 0, so 0 is free to mean "N/A".
+NO_PRIORITY = 0
+
+
+def _zeros(n):
+    return array("q", bytes(8 * n))
+
+
+def _frozen_setattr(self, name, value):
+    raise AttributeError(f"{type(self).__name__} is immutable")
+
+
+class JobSpec:
+    # Frozen description of one job. Safe to share between runs, threads and
+    # worker processes since nothing ever writes to it.
+    __slots__ = ("pid", "arrival_time", "burst_time", "priority")
+
+    def __init__(self, pid, arrival_time, burst_time, priority=None):
+        object.__setattr__(self, "pid", pid)
+        object.__setattr__(self, "arrival_time", arrival_time)
+        object.__setattr__(self, "burst_time", burst_time)
+        object.__setattr__(self, "priority", priority)
+
+    __setattr__ = _frozen_setattr
+
+    def __reduce__(self):
+        return (JobSpec, (self.pid, self.arrival_time, self.burst_time, self.priority))
+
+    def __eq__(self, other):
+        if not isinstance(other, JobSpec):
+            return NotImplemented
+        return (self.pid, self.arrival_time, self.burst_time, self.priority) == \
+               (other.pid, other.arrival_time, other.burst_time, other.priority)
+
+    def __hash__(self):
+        return hash((self.pid, self.arrival_time, self.burst_time, self.priority))
+
+    def __repr__(self):
+        return (f"JobSpec({self.pid}, arrival={self.arrival_time}, "
+                f"burst={self.burst_time}, priority={self.priority})")
+
+
+class Workload:
+    # Immutable, column-oriented set of jobs. Every field lives in its own
+    # typed array so a job costs 4 * 8 bytes instead of a Process object with
+    # a __dict__. Engines read the columns directly and JobSpec rows are only
+    # built when someone indexes or iterates the workload.
+    __slots__ = ("pid", "arrival", "burst", "priority")
+
+    def __init__(self, pid, arrival, burst, priority):
+        if not len(pid) == len(arrival) == len(burst) == len(priority):
+            raise ValueError("Workload columns must have the same length")
+        object.__setattr__(self, "pid", array("q", pid))
+        object.__setattr__(self, "arrival", array("q", arrival))
+        object.__setattr__(self, "burst", array("q", burst))
+        object.__setattr__(self, "priority", array("q", priority))
+
+    __setattr__ = _frozen_setattr
+
+    def __reduce__(self):
+        return (Workload, (self.pid, self.arrival, self.burst, self.priority))
+
+    @classmethod
+    def adopt(cls, pid, arrival, burst, priority):
+        # Wrap array("q") columns without copying them. The caller hands the
+        # arrays over and must not modify them afterwards.
+        if not len(pid) == len(arrival) == len(burst) == len(priority):
+            raise ValueError("Workload columns must have the same length")
+        workload = object.__new__(cls)
+        object.__setattr__(workload, "pid", pid)
+        object.__setattr__(workload, "arrival", arrival)
+        object.__setattr__(workload, "burst", burst)
+        object.__setattr__(workload, "priority", priority)
+        return workload
+
+    @classmethod
+    def from_columns(cls, arrival, burst, priority=None, pid=None):
+        n = len(arrival)
+        return cls(range(n) if pid is None else pid, arrival, burst,
+                   _zeros(n) if priority is None else priority)
+
+    @classmethod
+    def from_processes(cls, processes):
+        # Accepts JobSpec or Process objects from any of the scripts, with
+        # pid "P3" or 3
+        pid, arrival, burst, priority = array("q"), array("q"), array("q"), array("q")
+        for p in processes:
+            pid.append(int(str(p.pid).lstrip("P")))
+            arrival.append(p.arrival_time)
+            burst.append(p.burst_time)
+            priority.append(NO_PRIORITY if p.priority is None else p.priority)
+        return cls(pid, arrival, burst, priority)
+
+    def __len__(self):
+        return len(self.arrival)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("workload index out of range")
+        priority = self.priority[index]
+        return JobSpec(f"P{self.pid[index]}", self.arrival[index], self.burst[index],
+                       None if priority == NO_PRIORITY else priority)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def nbytes(self):
+        return sum(column.itemsize * len(column) for column in (
+            self.pid, self.arrival, self.burst, self.priority))
+
+
+class Result:
+    # Outcome of one simulate() run, kept apart from the workload so the same
+    # workload can go through any number of runs. Only completion times are
+    # stored, turnaround and waiting time are derived from the workload.
+    __slots__ = ("workload", "algorithm", "params", "completion", "execution_log")
+
+    def __init__(self, workload, algorithm, params, completion, execution_log):
+        object.__setattr__(self, "workload", workload)
+        object.__setattr__(self, "algorithm", algorithm)
+        object.__setattr__(self, "params", dict(params))
+        object.__setattr__(self, "completion", array("q", completion))
+        object.__setattr__(self, "execution_log", execution_log)
+
+    __setattr__ = _frozen_setattr
+
+    def __reduce__(self):
+        return (Result, (self.workload, self.algorithm, self.params,
+                         self.completion, self.execution_log))
+
+    def __len__(self):
+        return len(self.completion)
+
+    @property
+    def turnaround(self):
+        return array("q", map(int.__sub__, self.completion, self.workload.arrival))
+
+    @property
+    def waiting(self):
+        return array("q", map(int.__sub__, self.turnaround, self.workload.burst))
+
+    def average_turnaround(self):
+        return (sum(self.completion) - sum(self.workload.arrival)) / len(self)
+
+    def average_waiting(self):
+        return (sum(self.completion) - sum(self.workload.arrival)
+                - sum(self.workload.burst)) / len(self)
+
+    def rows(self):
+        # (pid, arrival, burst, priority, completion, turnaround, waiting)
+        # for every job, in workload order
+        for job, completion in zip(self.workload, self.completion):
+            turnaround = completion - job.arrival_time
+            yield (job.pid, job.arrival_time, job.burst_time, job.priority,
+                   completion, turnaround, turnaround - job.burst_time)
+
+    def pid_log(self):
+        # Execution log with pids instead of row indices, as the Gantt chart
+        # printers and the GUI expect it
+        pid = self.workload.pid
+        return [[f"P{pid[j]}", start, end] for j, start, end in self.execution_log]